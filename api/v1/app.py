@@ -5,13 +5,20 @@
 from flask import Flask, make_response, jsonify
 from flask_cors import CORS
 from models import storage
+from api.v1.cache import response_cache
+from api.v1.json_provider import json_provider_class
 from api.v1.views import app_views
 from os import getenv
 
 
 app = Flask(__name__)
+app.json = json_provider_class()(app)
 CORS(app, origins="0.0.0.0")
 app.register_blueprint(app_views)
+if response_cache is not None:
+    storage.on_new(response_cache.invalidate_event)
+    storage.on_save(response_cache.invalidate_event)
+    storage.on_delete(response_cache.invalidate_event)
 
 
 @app.teardown_appcontext
@@ -0,0 +1,292 @@
+#!/usr/bin/python3
+'''
+    response cache for the read endpoints of the RESTful API
+
+    HBNB_API_CACHE selects where responses are kept: "memory" for a
+    cache private to the process, "file" for a directory shared by the
+    workers (HBNB_API_CACHE_DIR, under /dev/shm when it exists so it
+    lives in shared memory); the cache is off when it is unset.
+    HBNB_API_CACHE_SIZE bounds the number of responses and
+    HBNB_API_CACHE_TTL the seconds each one is served for.
+
+    Every response is stored with tags naming what it was built from:
+    "State" for every State, "State.id=<id>" for one of them and
+    "City.state_id=<id>" for the cities of a state. Storage change
+    events invalidate the tags of the changed object, see
+    invalidate_event()
+'''
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from hashlib import sha1
+from os import getenv
+
+
+class ResponseCache:
+    '''
+        counters and tag invalidation shared by the cache modes
+    '''
+    mode = None
+
+    def __init__(self, max_size, ttl):
+        '''
+            max_size: number of responses kept before evicting the
+                      least recently used
+            ttl: seconds a response is served for
+        '''
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def invalidate_event(self, event):
+        '''
+            storage listener: invalidates the responses built from the
+            object of the event, before or after the change of its
+            references
+        '''
+        name = event.class_name
+        tags = [name, "{}.id={}".format(name, event.id)]
+        for attr, values in event.refs.items():
+            tags.extend("{}.{}={}".format(name, attr, value)
+                        for value in values)
+        self.invalidate(tags)
+
+    def stats(self):
+        '''
+            return the counters, for tuning size and ttl
+        '''
+        return {"mode": self.mode, "size": len(self), "max_size":
+                self.max_size, "ttl": self.ttl, "hits": self.hits,
+                "misses": self.misses, "evictions": self.evictions}
+
+
+class MemoryCache(ResponseCache):
+    '''
+        LRU cache of responses private to the process
+    '''
+    mode = "memory"
+
+    def __init__(self, max_size, ttl):
+        super().__init__(max_size, ttl)
+        self.__entries = OrderedDict()
+        self.__keys = {}
+        self.__clock = 0
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def begin(self, tags):
+        '''
+            return the token to pass to set() for a response about to
+            be built from tags
+        '''
+        return time.monotonic(), self.__clock
+
+    def get(self, key):
+        '''
+            return the value stored under key, or None
+        '''
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                self.__drop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def set(self, key, tags, value, token):
+        '''
+            store value under key, unless tags may have been
+            invalidated since begin() returned token
+        '''
+        started, clock = token
+        with self.__lock:
+            if clock != self.__clock:
+                return
+            self.__drop(key)
+            self.__entries[key] = (started + self.ttl, tags, value)
+            for tag in tags:
+                self.__keys.setdefault(tag, set()).add(key)
+            while len(self.__entries) > self.max_size:
+                self.__drop(next(iter(self.__entries)))
+                self.evictions += 1
+
+    def invalidate(self, tags):
+        '''
+            drop the responses built from any of tags
+        '''
+        with self.__lock:
+            self.__clock += 1
+            for tag in tags:
+                for key in list(self.__keys.get(tag, ())):
+                    self.__drop(key)
+
+    def __drop(self, key):
+        '''
+            remove key and its tags
+        '''
+        entry = self.__entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[1]:
+            keys = self.__keys[tag]
+            keys.discard(key)
+            if not keys:
+                del self.__keys[tag]
+
+
+class FileCache(ResponseCache):
+    '''
+        LRU cache of responses in a directory shared by the workers
+
+        Each tag has a file holding a random token that invalidate()
+        replaces; a response is only served while the tokens it was
+        stored with are current, whichever worker invalidated them.
+        The counters are those of this worker
+    '''
+    mode = "file"
+
+    def __init__(self, path, max_size, ttl):
+        '''
+            path: directory holding the responses and tags
+        '''
+        super().__init__(max_size, ttl)
+        self.path = path
+        os.makedirs(path, mode=0o700, exist_ok=True)
+
+    def __len__(self):
+        return sum(1 for name in os.listdir(self.path)
+                   if name.endswith(".entry"))
+
+    def __file(self, name, ext):
+        '''
+            return the path of the file of name
+        '''
+        return os.path.join(self.path,
+                            sha1(name.encode()).hexdigest() + ext)
+
+    def __token(self, tag):
+        '''
+            return the current token of tag, or None
+        '''
+        try:
+            with open(self.__file(tag, ".tag"), 'r') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def __write(self, path, data):
+        '''
+            replace the content of path atomically
+        '''
+        tmp = "{}.{}.{}.tmp".format(path, os.getpid(),
+                                    threading.get_ident())
+        with open(tmp, 'w') as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def begin(self, tags):
+        '''
+            return the token to pass to set() for a response about to
+            be built from tags
+        '''
+        return time.time(), {tag: self.__token(tag) for tag in tags}
+
+    def get(self, key):
+        '''
+            return the value stored under key, or None
+        '''
+        path = self.__file(key, ".entry")
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            entry = None
+        if entry is not None and (
+                entry["expires"] < time.time() or
+                any(self.__token(tag) != token
+                    for tag, token in entry["tokens"].items())):
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        self.hits += 1
+        return entry["status"], entry["headers"], entry["body"]
+
+    def set(self, key, tags, value, token):
+        '''
+            store value, a (status, headers, text body) tuple, under key
+        '''
+        started, tokens = token
+        status, headers, body = value
+        self.__write(self.__file(key, ".entry"), json.dumps({
+            "expires": started + self.ttl, "tokens": tokens,
+            "status": status, "headers": headers, "body": body}))
+        self.__evict()
+
+    def invalidate(self, tags):
+        '''
+            make the responses built from any of tags stale
+        '''
+        for tag in tags:
+            self.__write(self.__file(tag, ".tag"), uuid.uuid4().hex)
+
+    def __evict(self):
+        '''
+            remove the least recently used responses over max_size, and
+            the tags no live response can still depend on
+        '''
+        entries = []
+        expired = time.time() - self.ttl
+        for item in os.scandir(self.path):
+            try:
+                mtime = item.stat().st_mtime
+                if item.name.endswith(".entry"):
+                    entries.append((mtime, item.path))
+                elif item.name.endswith(".tag") and mtime < expired:
+                    os.remove(item.path)
+            except FileNotFoundError:
+                pass
+        entries.sort()
+        for mtime, path in entries[:max(len(entries) - self.max_size, 0)]:
+            try:
+                os.remove(path)
+                self.evictions += 1
+            except FileNotFoundError:
+                pass
+
+
+def make_cache():
+    '''
+        return the cache configured by HBNB_API_CACHE, or None
+    '''
+    mode = getenv("HBNB_API_CACHE")
+    max_size = int(getenv("HBNB_API_CACHE_SIZE", "1024"))
+    ttl = float(getenv("HBNB_API_CACHE_TTL", "30"))
+    if mode == "memory":
+        return MemoryCache(max_size, ttl)
+    if mode == "file":
+        base = "/dev/shm" if os.path.isdir("/dev/shm") else \
+            tempfile.gettempdir()
+        path = getenv("HBNB_API_CACHE_DIR",
+                      os.path.join(base, "hbnb_api_cache"))
+        return FileCache(path, max_size, ttl)
+    return None
+
+
+response_cache = make_cache()
@@ -0,0 +1,110 @@
+#!/usr/bin/python3
+'''
+    JSON encoding of the responses of the RESTful API
+
+    The views hand lists of to_dict() dictionaries to jsonify, whose
+    timestamps are already ISO strings, so encoding is only a matter of
+    dicts, lists and scalars. The providers below write them compact,
+    in insertion order and without Flask's debug indentation.
+
+    HBNB_API_JSON selects the encoder: "orjson" or "json" (the standard
+    library); when it is unset orjson is used if it is installed
+'''
+import json
+from datetime import date, datetime
+from os import getenv
+
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def default(obj):
+    '''
+        encode the values json does not know about: dates as ISO
+        strings and sets as lists
+    '''
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError("Object of type {} is not JSON serializable".format(
+        type(obj).__name__))
+
+
+class CompactJSONProvider(JSONProvider):
+    '''
+        standard library encoder, compact, with unsorted keys and
+        without escaping non-ASCII characters, so that its output is
+        the same as orjson's
+    '''
+    name = "json"
+
+    def dumps(self, obj, **kwargs):
+        '''
+            return obj encoded as a JSON string
+        '''
+        kwargs.setdefault("separators", (",", ":"))
+        kwargs.setdefault("ensure_ascii", False)
+        kwargs.setdefault("default", default)
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        '''
+            return the value encoded in the JSON string or bytes s
+        '''
+        return json.loads(s, **kwargs)
+
+
+class ORJSONProvider(CompactJSONProvider):
+    '''
+        orjson encoder, several times faster than the standard library
+        on the lists of objects returned by the views
+    '''
+    name = "orjson"
+    options = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+    def dumps(self, obj, **kwargs):
+        '''
+            return obj encoded as a JSON string, through the standard
+            library when given options orjson does not have
+        '''
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=default,
+                            option=self.options).decode()
+
+    def loads(self, s, **kwargs):
+        '''
+            return the value encoded in the JSON string or bytes s
+        '''
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        '''
+            return a JSON response, from the bytes of orjson without
+            decoding them
+        '''
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=default, option=self.options),
+            mimetype="application/json")
+
+
+def json_provider_class():
+    '''
+        return the provider class configured by HBNB_API_JSON
+    '''
+    backend = getenv("HBNB_API_JSON")
+    if backend == "json":
+        return CompactJSONProvider
+    if backend == "orjson" and orjson is None:
+        raise ImportError("HBNB_API_JSON=orjson but orjson is not installed")
+    if orjson is not None:
+        return ORJSONProvider
+    return CompactJSONProvider
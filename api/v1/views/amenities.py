@@ -4,29 +4,46 @@
 '''
 from flask import Flask, jsonify, abort, request
 from api.v1.views import app_views
+from api.v1.views.helpers import (conditional, fields_arg, is_paged,
+                                  many_response, page_response, stream_list)
 from models import storage
 from models.amenity import Amenity
 
 
 @app_views.route('/amenities', methods=['GET'], strict_slashes=False)
+@conditional(("Amenity", {}))
 def get_amenities():
     '''
         return all amenity objects in json form
     '''
-    amenity_list = [a.to_dict() for a in storage.all('Amenity').values()]
-    return jsonify(amenity_list)
+    if 'ids' in request.args:
+        return many_response(Amenity)
+    if is_paged():
+        return page_response(Amenity)
+    fields = fields_arg()
+    return stream_list(storage.iter('Amenity', fields=fields), fields)
+
+
+@app_views.route('/amenities/lookup', methods=['POST'], strict_slashes=False)
+def lookup_amenities():
+    '''
+        return the amenity objects with the ids listed in the body
+    '''
+    return many_response(Amenity)
 
 
 @app_views.route('/amenities/<amenity_id>',
                  methods=['GET'], strict_slashes=False)
+@conditional(("Amenity", {"id": "amenity_id"}))
 def get_amenity_id(amenity_id):
     '''
         return amenity with given id using http verb GET
     '''
-    amenity = storage.get("Amenity", amenity_id)
+    fields = fields_arg()
+    amenity = storage.get("Amenity", amenity_id, fields=fields)
     if amenity is None:
         abort(404)
-    return jsonify(amenity.to_dict())
+    return jsonify(amenity.to_dict(fields=fields))
 
 
 @app_views.route('/amenities/<amenity_id>',
@@ -0,0 +1,62 @@
+#!/usr/bin/python3
+'''
+    RESTful API for the change feed
+'''
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from flask import abort, jsonify, make_response, request
+from api.v1.views import app_views
+from api.v1.views.helpers import fields_arg, limit_arg
+from models import storage
+
+
+@app_views.route('/changes', methods=['GET'], strict_slashes=False)
+def get_changes():
+    '''
+        return the objects put or deleted since the since query
+        parameter, a cursor from a previous page or an ISO timestamp,
+        or since the start without it
+
+        {"results": [{"op": "put", "class": ..., "id": ...,
+                      "object": {...}}, {"op": "delete", ...}],
+         "next": cursor to pass as since to resume,
+         "has_more": true when the page is full,
+         "reset": true when the cursor is too old and the feed starts
+                  again with every object}
+    '''
+    since = after = None
+    if request.args.get('since'):
+        try:
+            after = json.loads(urlsafe_b64decode(
+                request.args['since'].encode()))
+            if type(after) is not list:
+                raise ValueError("not a cursor")
+        except ValueError:
+            after = None
+            try:
+                since = datetime.fromisoformat(request.args['since'])
+            except ValueError:
+                abort(make_response(jsonify({"error": "Invalid since"}),
+                                    400))
+            if since.tzinfo is not None:
+                since = since.astimezone().replace(tzinfo=None)
+    limit = limit_arg()
+    fields = fields_arg()
+    try:
+        entries, reset = storage.changes(since=since, after=after,
+                                         limit=limit)
+    except ValueError:
+        abort(make_response(jsonify({"error": "Invalid since"}), 400))
+    results = []
+    for cursor, op, name, id, obj in entries:
+        result = {"op": op, "class": name, "id": id}
+        if obj is not None:
+            result["object"] = obj.to_dict(fields=fields)
+        results.append(result)
+    next_cursor = request.args.get('since')
+    if entries:
+        next_cursor = urlsafe_b64encode(
+            json.dumps(entries[-1][0]).encode()).decode()
+    return jsonify({"results": results, "next": next_cursor,
+                    "has_more": len(entries) == limit, "reset": reset})
@@ -5,31 +5,61 @@
 from flask import Flask, jsonify, abort, request
 from models import storage
 from api.v1.views import app_views
+from api.v1.views.helpers import (conditional, fields_arg, is_paged,
+                                  many_response, page_response)
 from models.city import City
 
 
+@app_views.route('/cities', methods=['GET'], strict_slashes=False)
+@conditional(("City", {}))
+def get_cities_by_ids():
+    '''
+        return the city objects listed in ?ids=a,b,c
+    '''
+    if 'ids' not in request.args:
+        return jsonify({"error": "Missing ids"}), 400
+    return many_response(City)
+
+
+@app_views.route('/cities/lookup', methods=['POST'], strict_slashes=False)
+def lookup_cities():
+    '''
+        return the city objects with the ids listed in the body
+    '''
+    return many_response(City)
+
+
 @app_views.route('/states/<state_id>/cities', methods=['GET'],
                  strict_slashes=False)
+@conditional(("State", {"id": "state_id"}),
+             ("City", {"state_id": "state_id"}))
 def get_city_by_state(state_id):
     '''
         return cities in state, json form
     '''
-    state = storage.get("State", state_id)
+    fields = fields_arg()
+    with_related = () if is_paged() else ("cities",)
+    state = storage.get("State", state_id, with_related=with_related,
+                        related_fields=fields)
     if state is None:
         abort(404)
-    city_list = [c.to_dict() for c in state.cities]
+    if is_paged():
+        return page_response(City, state_id=state.id)
+    city_list = [c.to_dict(fields=fields) for c in state.cities]
     return jsonify(city_list), 200
 
 
 @app_views.route('/cities/<city_id>', methods=['GET'], strict_slashes=False)
+@conditional(("City", {"id": "city_id"}))
 def get_city_id(city_id):
     '''
         return city and its id using GET
     '''
-    city = storage.get("City", city_id)
+    fields = fields_arg()
+    city = storage.get("City", city_id, fields=fields)
     if city is None:
         abort(404)
-    return jsonify(city.to_dict()), 200
+    return jsonify(city.to_dict(fields=fields)), 200
 
 
 @app_views.route('/cities/<city_id>', methods=['DELETE'], strict_slashes=False)
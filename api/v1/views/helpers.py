@@ -0,0 +1,288 @@
+#!/usr/bin/python3
+'''
+    helpers shared by the RESTful API views
+'''
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime, timezone
+from functools import wraps
+from hashlib import sha1
+from flask import (Response, abort, current_app, jsonify, make_response,
+                   request, stream_with_context)
+from api.v1.cache import response_cache
+from models import storage
+
+
+PAGE_LIMIT = 100
+PAGE_LIMIT_MAX = 1000
+BATCH_LIMIT = 1000
+
+
+def cached(*specs):
+    '''
+        serve a GET view from the response cache, keyed by its URL and
+        query string, when one is configured
+
+        specs are (class name, filters) pairs as for conditional(), the
+        cached response is dropped when storage changes what they
+        select. Streamed responses are not cached, that would buffer
+        them whole
+    '''
+    def decorator(view):
+        @wraps(view)
+        def wrapper(**kwargs):
+            if response_cache is None:
+                return view(**kwargs)
+            key = request.full_path
+            value = response_cache.get(key)
+            if value is not None:
+                status, headers, body = value
+                response = Response(body, status=status, headers=headers)
+                return response.make_conditional(request)
+            tags = []
+            for cls, filters in specs:
+                tags.extend(["{}.{}={}".format(cls, column, kwargs[arg])
+                             for column, arg in filters.items()] or [cls])
+            token = response_cache.begin(tags)
+            response = make_response(view(**kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                value = (response.status_code, list(response.headers),
+                         response.get_data(as_text=True))
+                response_cache.set(key, tags, value, token)
+            return response
+        return wrapper
+    return decorator
+
+
+def conditional(*specs):
+    '''
+        make a GET view answer 304 Not Modified, without loading or
+        serializing any object, when the If-None-Match or
+        If-Modified-Since of the request is still current; the view is
+        also cached()
+
+        specs are (class name, filters) pairs, where filters maps a
+        column to the name of the view argument holding its value; the
+        ETag covers storage.version() of each of them and the URL with
+        its query string. Last-Modified only has whole seconds, so
+        clients should prefer If-None-Match
+    '''
+    def decorator(view):
+        @cached(*specs)
+        @wraps(view)
+        def wrapper(**kwargs):
+            versions = [storage.version(cls, **{
+                column: kwargs[arg] for column, arg in filters.items()})
+                for cls, filters in specs]
+            etag = sha1(repr((request.full_path, [tag for tag, _ in versions]))
+                        .encode()).hexdigest()
+            dates = [date for _, date in versions if date]
+            last_modified = None
+            if dates:
+                last_modified = max(dates).astimezone(timezone.utc).replace(
+                    microsecond=0)
+            if request.if_none_match:
+                fresh = request.if_none_match.contains(etag)
+            else:
+                since = request.if_modified_since
+                fresh = bool(last_modified and since and
+                             last_modified <= since)
+            if fresh:
+                response = Response(status=304)
+            else:
+                response = make_response(view(**kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            response.last_modified = last_modified
+            return response
+        return wrapper
+    return decorator
+
+
+def fields_arg():
+    '''
+        return the field names asked for by ?fields=a,b,c, or None when
+        every field is wanted
+    '''
+    if 'fields' not in request.args:
+        return None
+    return tuple(f for f in request.args['fields'].split(',') if f)
+
+
+def stream_list(objs, fields=None):
+    '''
+        stream objs as a JSON list of their to_dict() forms,
+        one object at a time, instead of building the whole list;
+        when a response cache is configured the list is built whole,
+        so that cached() can store it
+    '''
+    def generate():
+        yield '['
+        for i, obj in enumerate(objs):
+            if i:
+                yield ','
+            yield current_app.json.dumps(obj.to_dict(fields=fields))
+        yield ']\n'
+    if response_cache is not None:
+        return Response(''.join(generate()), mimetype='application/json')
+    return Response(stream_with_context(generate()),
+                    mimetype='application/json')
+
+
+def encode_cursor(obj):
+    '''
+        return an opaque cursor pointing just after obj
+    '''
+    raw = "{}|{}".format(obj.created_at.isoformat(), obj.id)
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    '''
+        return the (created_at, id) a cursor points after; ValueError
+        when it is not one of encode_cursor(), whose times are naive
+    '''
+    created_at, id = urlsafe_b64decode(cursor.encode()).decode().split('|')
+    created_at = datetime.fromisoformat(created_at)
+    if created_at.tzinfo is not None:
+        raise ValueError("cursor time has a timezone")
+    return created_at, id
+
+
+def is_paged():
+    '''
+        true if the request asks for a page rather than a full list
+    '''
+    return 'limit' in request.args or 'cursor' in request.args
+
+
+def limit_arg():
+    '''
+        return the page size requested by the limit query parameter
+    '''
+    try:
+        limit = int(request.args.get('limit', PAGE_LIMIT))
+    except ValueError:
+        limit = 0
+    if limit < 1:
+        abort(make_response(jsonify({"error": "Invalid limit"}), 400))
+    return min(limit, PAGE_LIMIT_MAX)
+
+
+def page_args():
+    '''
+        return the (limit, after) requested by the limit and cursor
+        query parameters
+    '''
+    limit = limit_arg()
+    after = None
+    if request.args.get('cursor'):
+        try:
+            after = decode_cursor(request.args['cursor'])
+        except ValueError:
+            abort(make_response(jsonify({"error": "Invalid cursor"}), 400))
+    return limit, after
+
+
+def paged(objs, limit, fields=None):
+    '''
+        return objs as {"results": [...], "next": cursor}, where objs
+        holds up to limit + 1 objects and the extra one means there is
+        a next page
+    '''
+    next_cursor = None
+    if len(objs) > limit:
+        objs = objs[:limit]
+        next_cursor = encode_cursor(objs[-1])
+    return jsonify({"results": [o.to_dict(fields=fields) for o in objs],
+                    "next": next_cursor})
+
+
+def page_response(cls, **filters):
+    '''
+        return one page of cls objects matching filters, ordered by
+        (created_at, id)
+    '''
+    limit, after = page_args()
+    fields = fields_arg()
+    return paged(storage.page(cls, limit + 1, after, fields=fields,
+                              **filters), limit, fields)
+
+
+def batch_items():
+    '''
+        return the list of items in the request body, or abort with 400
+        unless it is a list of at most BATCH_LIMIT items
+    '''
+    items = request.get_json(silent=True)
+    if type(items) is not list:
+        abort(make_response(jsonify({"error": "Not a JSON list"}), 400))
+    if len(items) > BATCH_LIMIT:
+        abort(make_response(jsonify({"error": "Too many items"}), 400))
+    return items
+
+
+def batch_ids(items, field):
+    '''
+        return the string values of field in the dict items of a batch
+    '''
+    return [item[field] for item in items
+            if type(item) is dict and type(item.get(field)) is str]
+
+
+def invalid_field(cls, obj_data):
+    '''
+        return the first key of obj_data that cannot be set on a cls
+        object: a private or read-only attribute, a relationship, a
+        column given a value of another type, or null for a NOT NULL
+        column; None when every key can be set
+    '''
+    relationships = cls.__mapper__.relationships
+    for key in obj_data:
+        attr = getattr(cls, key, None)
+        if key.startswith('_') or key in relationships or \
+                (isinstance(attr, property) and attr.fset is None):
+            return key
+    for column in cls.__table__.columns:
+        value = obj_data.get(column.name)
+        if value is None:
+            if column.name in obj_data and not column.nullable:
+                return column.name
+            continue
+        python_type = column.type.python_type
+        if python_type is float:
+            python_type = (int, float)
+        if not isinstance(value, python_type):
+            return column.name
+    return None
+
+
+def requested_ids():
+    '''
+        return the ids asked for by ?ids=a,b,c, or by a POST body of
+        {"ids": [...]}, in order and without duplicates
+    '''
+    if request.method == 'POST':
+        obj_data = request.get_json(silent=True)
+        ids = obj_data.get("ids") if type(obj_data) is dict else None
+        if type(ids) is not list:
+            abort(make_response(jsonify({"error": "Missing ids"}), 400))
+        ids = [str(i) for i in ids]
+    else:
+        ids = [i for i in request.args.get('ids', '').split(',') if i]
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > BATCH_LIMIT:
+        abort(make_response(jsonify({"error": "Too many ids"}), 400))
+    return ids
+
+
+def many_response(cls):
+    '''
+        return the cls objects with the requested ids, in the order
+        asked, skipping the ids that do not exist
+    '''
+    ids = requested_ids()
+    fields = fields_arg()
+    objs = storage.get_many(cls, ids, fields=fields)
+    return jsonify([objs[id].to_dict(fields=fields)
+                    for id in ids if id in objs])
@@ -4,9 +4,13 @@
     routes:
         /status:    display "status":"OK"
         /stats:     dispaly total for all classes
+        /stats/pool: display database connection pool usage
+        /stats/cache: display response cache counters
 '''
+from api.v1.cache import response_cache
 from api.v1.views import app_views
-from flask import jsonify
+from api.v1.views.helpers import cached
+from flask import abort, jsonify
 from models import storage
 
 
@@ -19,16 +23,39 @@ def status():
 
 
 @app_views.route("/stats")
+@cached(("Amenity", {}), ("City", {}), ("Place", {}), ("Review", {}),
+        ("State", {}), ("User", {}))
 def storage_counts():
     '''
         return counts of all classes in storage
     '''
+    counts = storage.counts()
     cls_counts = {
-        "amenities": storage.count("Amenity"),
-        "cities": storage.count("City"),
-        "places": storage.count("Place"),
-        "reviews": storage.count("Review"),
-        "states": storage.count("State"),
-        "users": storage.count("User")
+        "amenities": counts["Amenity"],
+        "cities": counts["City"],
+        "places": counts["Place"],
+        "reviews": counts["Review"],
+        "states": counts["State"],
+        "users": counts["User"]
     }
     return jsonify(cls_counts)
+
+
+@app_views.route("/stats/pool")
+def pool_stats():
+    '''
+        return connection pool usage, only with the database engine
+    '''
+    if not hasattr(storage, "pool_stats"):
+        abort(404)
+    return jsonify(storage.pool_stats())
+
+
+@app_views.route("/stats/cache")
+def cache_stats():
+    '''
+        return response cache counters, only when the cache is on
+    '''
+    if response_cache is None:
+        abort(404)
+    return jsonify(response_cache.stats())
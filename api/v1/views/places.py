@@ -5,31 +5,63 @@
 from flask import Flask, jsonify, abort, request
 from models import storage
 from api.v1.views import app_views
+from api.v1.views.helpers import (batch_ids, batch_items, conditional,
+                                  fields_arg, invalid_field, is_paged,
+                                  many_response, page_args, page_response,
+                                  paged, stream_list)
 from models.place import Place
 
 
+@app_views.route('/places', methods=['GET'], strict_slashes=False)
+@conditional(("Place", {}))
+def get_places_by_ids():
+    '''
+        return the place objects listed in ?ids=a,b,c
+    '''
+    if 'ids' not in request.args:
+        return jsonify({"error": "Missing ids"}), 400
+    return many_response(Place)
+
+
+@app_views.route('/places/lookup', methods=['POST'], strict_slashes=False)
+def lookup_places():
+    '''
+        return the place objects with the ids listed in the body
+    '''
+    return many_response(Place)
+
+
 @app_views.route('/cities/<city_id>/places', methods=['GET'],
                  strict_slashes=False)
+@conditional(("City", {"id": "city_id"}),
+             ("Place", {"city_id": "city_id"}))
 def get_place_by_city(city_id):
     '''
         return places in city using GET
     '''
-    city = storage.get("City", city_id)
+    fields = fields_arg()
+    with_related = () if is_paged() else ("places",)
+    city = storage.get("City", city_id, with_related=with_related,
+                       related_fields=fields)
     if city is None:
         abort(404)
-    places_list = [p.to_dict() for p in city.places]
+    if is_paged():
+        return page_response(Place, city_id=city.id)
+    places_list = [p.to_dict(fields=fields) for p in city.places]
     return jsonify(places_list), 200
 
 
 @app_views.route('/places/<place_id>', methods=['GET'], strict_slashes=False)
+@conditional(("Place", {"id": "place_id"}))
 def get_place_id(place_id):
     '''
         return place and its id using GET
     '''
-    place = storage.get("Place", place_id)
+    fields = fields_arg()
+    place = storage.get("Place", place_id, fields=fields)
     if place is None:
         abort(404)
-    return jsonify(place.to_dict()), 200
+    return jsonify(place.to_dict(fields=fields)), 200
 
 
 @app_views.route('/places/<place_id>', methods=['DELETE'],
@@ -89,3 +121,118 @@ def update_place(place_id):
             setattr(obj, k, v)
     obj.save()
     return jsonify(obj.to_dict()), 200
+
+
+@app_views.route('/places/batch', methods=['POST'], strict_slashes=False)
+def create_places():
+    '''
+        create many place objs in one transaction
+        body: list of place objects, each with city_id, user_id and name;
+              id, created_at and updated_at are ignored
+        return: one {"status", "place" or "error"} per item, in order
+    '''
+    items = batch_items()
+    cities = storage.get_many("City", batch_ids(items, "city_id"))
+    users = storage.get_many("User", batch_ids(items, "user_id"))
+    ignore = ("id", "created_at", "updated_at", "__class__")
+    results = []
+    objs = []
+    for obj_data in items:
+        if type(obj_data) is not dict:
+            results.append({"status": 400, "error": "Not a JSON"})
+            continue
+        obj_data = {k: v for k, v in obj_data.items() if k not in ignore}
+        missing = [field for field in ("city_id", "user_id", "name")
+                   if field not in obj_data]
+        if missing:
+            results.append({"status": 400,
+                            "error": "Missing {}".format(missing[0])})
+            continue
+        invalid = invalid_field(Place, obj_data)
+        if invalid:
+            results.append({"status": 400,
+                            "error": "Invalid {}".format(invalid)})
+            continue
+        if cities.get(obj_data["city_id"]) is None or \
+                users.get(obj_data["user_id"]) is None:
+            results.append({"status": 404, "error": "Not found"})
+            continue
+        try:
+            obj = Place(**obj_data)
+        except (AttributeError, TypeError, ValueError):
+            results.append({"status": 400, "error": "Invalid place"})
+            continue
+        objs.append(obj)
+        results.append({"status": 201, "place": obj})
+    storage.bulk_save(objs)
+    for result in results:
+        if "place" in result:
+            result["place"] = result["place"].to_dict()
+    return jsonify(results), 200
+
+
+@app_views.route('/places/batch', methods=['PATCH'], strict_slashes=False)
+def update_places():
+    '''
+        update many place objs in one transaction
+        body: list of objects with the id of the place and the new values
+        return: one {"status", "place" or "error"} per item, in order
+    '''
+    items = batch_items()
+    places = storage.get_many("Place", batch_ids(items, "id"))
+    cities = storage.get_many("City", batch_ids(items, "city_id"))
+    ignore = ("id", "user_id", "created_at", "updated_at", "__class__")
+    results = []
+    objs = []
+    for obj_data in items:
+        if type(obj_data) is not dict:
+            results.append({"status": 400, "error": "Not a JSON"})
+            continue
+        obj = places.get(str(obj_data.get("id")))
+        if obj is None:
+            results.append({"status": 404, "error": "Not found"})
+            continue
+        changes = {k: v for k, v in obj_data.items() if k not in ignore}
+        invalid = invalid_field(Place, changes)
+        if invalid:
+            results.append({"status": 400,
+                            "error": "Invalid {}".format(invalid)})
+            continue
+        if "city_id" in changes and cities.get(changes["city_id"]) is None:
+            results.append({"status": 404, "error": "Not found"})
+            continue
+        for k, v in changes.items():
+            setattr(obj, k, v)
+        objs.append(obj)
+        results.append({"status": 200, "place": obj})
+    storage.bulk_save(objs)
+    for result in results:
+        if "place" in result:
+            result["place"] = result["place"].to_dict()
+    return jsonify(results), 200
+
+
+@app_views.route('/places_search', methods=['POST'], strict_slashes=False)
+def places_search():
+    '''
+        return places in the given states and cities that have all the
+        given amenities; every place when states and cities are empty
+    '''
+    obj_data = request.get_json(silent=True)
+    if type(obj_data) is not dict:
+        return jsonify({"error": "Not a JSON"}), 400
+    search = {}
+    for key in ("states", "cities", "amenities"):
+        ids = obj_data.get(key) or []
+        if type(ids) is not list or \
+                any(type(id) is not str for id in ids):
+            return jsonify({"error": "Not a list"}), 400
+        search[key] = ids
+    fields = fields_arg()
+    if is_paged():
+        limit, after = page_args()
+        return paged(storage.places_search(limit=limit + 1, after=after,
+                                           fields=fields, **search),
+                     limit, fields)
+    return stream_list(storage.places_search(fields=fields, **search),
+                       fields)
@@ -5,6 +5,7 @@
 from flask import Flask, jsonify, abort, request
 from models import storage
 from api.v1.views import app_views
+from api.v1.views.helpers import conditional, fields_arg
 from models.place import Place
 from models.amenity import Amenity
 
@@ -13,15 +14,18 @@ from models.amenity import Amenity
     '/places/<place_id>/amenities',
     methods=['GET'],
     strict_slashes=False)
+@conditional(("Place", {"id": "place_id"}), ("Amenity", {}))
 def get_place_amenities(place_id):
     '''
         Retrieves the list of all Amenity objects of a Place
     '''
-    place = storage.get("Place", place_id)
+    fields = fields_arg()
+    place = storage.get("Place", place_id, with_related=("amenities",),
+                        related_fields=fields)
     if place is None:
         abort(404)
 
-    amenities_list = [a.to_dict() for a in place.amenities]
+    amenities_list = [a.to_dict(fields=fields) for a in place.amenities]
     return jsonify(amenities_list)
 
 
@@ -45,7 +49,7 @@ def delete_place_amenity(place_id, amenity_id):
         abort(404)
 
     place.amenities.remove(amenity)
-    storage.save()
+    place.save()
     return jsonify({}), 200
 
 
@@ -69,5 +73,5 @@ def link_place_amenity(place_id, amenity_id):
         return jsonify(amenity.to_dict()), 200
 
     place.amenities.append(amenity)
-    storage.save()
+    place.save()
     return jsonify(amenity.to_dict()), 201
@@ -5,31 +5,61 @@
 from flask import Flask, jsonify, abort, request
 from models import storage
 from api.v1.views import app_views
+from api.v1.views.helpers import (batch_items, conditional, fields_arg,
+                                  is_paged, many_response, page_response)
 from models.review import Review
 
 
+@app_views.route('/reviews', methods=['GET'], strict_slashes=False)
+@conditional(("Review", {}))
+def get_reviews_by_ids():
+    '''
+        return the review objects listed in ?ids=a,b,c
+    '''
+    if 'ids' not in request.args:
+        return jsonify({"error": "Missing ids"}), 400
+    return many_response(Review)
+
+
+@app_views.route('/reviews/lookup', methods=['POST'], strict_slashes=False)
+def lookup_reviews():
+    '''
+        return the review objects with the ids listed in the body
+    '''
+    return many_response(Review)
+
+
 @app_views.route('/places/<place_id>/reviews', methods=['GET'],
                  strict_slashes=False)
+@conditional(("Place", {"id": "place_id"}),
+             ("Review", {"place_id": "place_id"}))
 def get_review_by_place(place_id):
     '''
         return reviews by place, json form
     '''
-    place = storage.get("Place", place_id)
+    fields = fields_arg()
+    with_related = () if is_paged() else ("reviews",)
+    place = storage.get("Place", place_id, with_related=with_related,
+                        related_fields=fields)
     if place is None:
         abort(404)
-    review_list = [r.to_dict() for r in place.reviews]
+    if is_paged():
+        return page_response(Review, place_id=place.id)
+    review_list = [r.to_dict(fields=fields) for r in place.reviews]
     return jsonify(review_list), 200
 
 
 @app_views.route('/reviews/<review_id>', methods=['GET'], strict_slashes=False)
+@conditional(("Review", {"id": "review_id"}))
 def get_review_id(review_id):
     '''
         return review given its id using GET
     '''
-    review = storage.get("Review", review_id)
+    fields = fields_arg()
+    review = storage.get("Review", review_id, fields=fields)
     if review is None:
         abort(404)
-    return jsonify(review.to_dict()), 200
+    return jsonify(review.to_dict(fields=fields)), 200
 
 
 @app_views.route('/reviews/<review_id>', methods=['DELETE'],
@@ -46,6 +76,27 @@ def delete_review(review_id):
     return jsonify({}), 200
 
 
+@app_views.route('/reviews/batch', methods=['DELETE'], strict_slashes=False)
+def delete_reviews():
+    '''
+        delete many review objs in one transaction
+        body: list of review ids
+        return: one {"id", "status"} per id, in order
+    '''
+    ids = batch_items()
+    reviews = storage.get_many("Review", [i for i in ids if type(i) is str])
+    results = []
+    for review_id in ids:
+        review = reviews.pop(str(review_id), None)
+        if review is None:
+            results.append({"id": review_id, "status": 404})
+            continue
+        storage.delete(review)
+        results.append({"id": review_id, "status": 200})
+    storage.save()
+    return jsonify(results), 200
+
+
 @app_views.route('/places/<place_id>/reviews', methods=['POST'],
                  strict_slashes=False)
 def create_review(place_id):
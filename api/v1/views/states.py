@@ -5,27 +5,44 @@
 from flask import Flask, jsonify, abort, request
 from models import storage
 from api.v1.views import app_views
+from api.v1.views.helpers import (conditional, fields_arg, is_paged,
+                                  many_response, page_response, stream_list)
 from models.state import State
 
 
 @app_views.route('/states', methods=['GET'], strict_slashes=False)
+@conditional(("State", {}))
 def get_state():
     '''
         return state in json form
     '''
-    state_list = [s.to_dict() for s in storage.all('State').values()]
-    return jsonify(state_list)
+    if 'ids' in request.args:
+        return many_response(State)
+    if is_paged():
+        return page_response(State)
+    fields = fields_arg()
+    return stream_list(storage.iter('State', fields=fields), fields)
+
+
+@app_views.route('/states/lookup', methods=['POST'], strict_slashes=False)
+def lookup_states():
+    '''
+        return the state objects with the ids listed in the body
+    '''
+    return many_response(State)
 
 
 @app_views.route('/states/<state_id>', methods=['GET'], strict_slashes=False)
+@conditional(("State", {"id": "state_id"}))
 def get_state_id(state_id):
     '''
         return state and its id using http verb GET
     '''
-    state = storage.get("State", state_id)
+    fields = fields_arg()
+    state = storage.get("State", state_id, fields=fields)
     if state is None:
         abort(404)
-    return jsonify(state.to_dict())
+    return jsonify(state.to_dict(fields=fields))
 
 
 @app_views.route(
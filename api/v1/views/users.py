@@ -4,28 +4,45 @@
 '''
 from flask import Flask, jsonify, abort, request
 from api.v1.views import app_views
+from api.v1.views.helpers import (conditional, fields_arg, is_paged,
+                                  many_response, page_response, stream_list)
 from models import storage
 from models.user import User
 
 
 @app_views.route('/users', methods=['GET'], strict_slashes=False)
+@conditional(("User", {}))
 def get_users():
     '''
         return all user objects in json form
     '''
-    user_list = [u.to_dict() for u in storage.all('User').values()]
-    return jsonify(user_list)
+    if 'ids' in request.args:
+        return many_response(User)
+    if is_paged():
+        return page_response(User)
+    fields = fields_arg()
+    return stream_list(storage.iter('User', fields=fields), fields)
+
+
+@app_views.route('/users/lookup', methods=['POST'], strict_slashes=False)
+def lookup_users():
+    '''
+        return the user objects with the ids listed in the body
+    '''
+    return many_response(User)
 
 
 @app_views.route('/users/<user_id>', methods=['GET'], strict_slashes=False)
+@conditional(("User", {"id": "user_id"}))
 def get_user_id(user_id):
     '''
         return user with given id using http verb GET
     '''
-    user = storage.get("User", user_id)
+    fields = fields_arg()
+    user = storage.get("User", user_id, fields=fields)
     if user is None:
         abort(404)
-    return jsonify(user.to_dict())
+    return jsonify(user.to_dict(fields=fields))
 
 
 @app_views.route('/users/<user_id>', methods=['DELETE'], strict_slashes=False)
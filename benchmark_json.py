@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+"""Times the JSON encoders of the API on Place and Review payloads like
+the ones the views return, without touching the storage.
+
+Usage: ./benchmark_json.py [number of objects per payload]
+"""
+import sys
+import timeit
+from uuid import uuid4
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from api.v1.json_provider import (CompactJSONProvider, ORJSONProvider,
+                                  orjson)
+from models.place import Place
+from models.review import Review
+
+
+def payloads(size):
+    """Builds the to_dict() lists of size places and size reviews
+    Return:
+        dictionary of payload name to list of dictionaries
+    """
+    city_id, user_id = str(uuid4()), str(uuid4())
+    places = [Place(city_id=city_id, user_id=user_id,
+                    name="Place {}".format(i),
+                    description="A cosy place with a view " * 8,
+                    number_rooms=i % 5, number_bathrooms=i % 3,
+                    max_guest=i % 7, price_by_night=40 + i,
+                    latitude=37.77 + i / 1000, longitude=-122.41)
+              for i in range(size)]
+    reviews = [Review(place_id=places[i].id, user_id=user_id,
+                      text="Great stay, would come back. " * 6)
+               for i in range(size)]
+    return {"places": [place.to_dict() for place in places],
+            "reviews": [review.to_dict() for review in reviews]}
+
+
+def providers():
+    """Return:
+        dictionary of encoder name to provider, orjson only when it is
+        installed
+    """
+    app = Flask(__name__)
+    encoders = {"flask default": DefaultJSONProvider(app),
+                "compact json": CompactJSONProvider(app)}
+    if orjson is not None:
+        encoders["orjson"] = ORJSONProvider(app)
+    return encoders
+
+
+def main(size):
+    """Prints the best time of each encoder on each payload"""
+    number = max(1, 20000 // size)
+    data = payloads(size)
+    encoders = providers()
+    print("{} objects per payload, best of 5 x {} runs".format(size, number))
+    for payload, objs in data.items():
+        base = None
+        for name, provider in encoders.items():
+            best = min(timeit.repeat(lambda: provider.dumps(objs),
+                                     number=number, repeat=5)) / number
+            base = base or best
+            print("{:8} {:14} {:9.1f} us  {:5.2f}x  {:7} bytes".format(
+                payload, name, best * 1e6, base / best,
+                len(provider.dumps(objs))))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
@@ -0,0 +1,41 @@
+#!/usr/bin/python3
+"""Adds the indexes declared on the models to an existing database
+created by setup_mysql_dev.sql, skipping the ones already there.
+
+Usage: HBNB_MYSQL_USER=hbnb_dev HBNB_MYSQL_PWD=hbnb_dev_pwd \
+       HBNB_MYSQL_HOST=localhost HBNB_MYSQL_DB=hbnb_dev_db \
+       HBNB_TYPE_STORAGE=db ./migrate_mysql_indexes.py
+"""
+from os import getenv
+from sqlalchemy import create_engine, inspect
+from models.base_model import Base
+import models
+
+
+def migrate(engine):
+    """Creates every index missing from the tables of the models
+    Return:
+        list of the names of the indexes created
+    """
+    created = []
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"]
+                    for index in inspector.get_indexes(table.name)}
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            if index.name not in existing:
+                index.create(engine)
+                created.append(index.name)
+    return created
+
+
+if __name__ == "__main__":
+    engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'
+                           .format(getenv("HBNB_MYSQL_USER"),
+                                   getenv("HBNB_MYSQL_PWD"),
+                                   getenv("HBNB_MYSQL_HOST"),
+                                   getenv("HBNB_MYSQL_DB")))
+    for name in migrate(engine):
+        print("created {}".format(name))
@@ -15,8 +15,10 @@ class BaseModel:
     for other classes
     """
     id = Column(String(60), unique=True, nullable=False, primary_key=True)
-    created_at = Column(DateTime, nullable=False, default=(datetime.utcnow()))
-    updated_at = Column(DateTime, nullable=False, default=(datetime.utcnow()))
+    created_at = Column(DateTime, nullable=False, default=(datetime.utcnow()),
+                        index=True)
+    updated_at = Column(DateTime, nullable=False, default=(datetime.utcnow()),
+                        index=True)
 
     def __init__(self, *args, **kwargs):
         """Instantiation of base model class
@@ -27,22 +29,33 @@ class BaseModel:
             id: unique id generated
             created_at: creation date
             updated_at: updated date
+        Attributes are set without __setattr__, storage has nothing to
+        be told about an object being built
         """
+        init = super().__setattr__
         if kwargs:
             for key, value in kwargs.items():
                 if key == "created_at" or key == "updated_at":
                     value = datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f")
                 if key != "__class__":
-                    setattr(self, key, value)
+                    init(key, value)
             if "id" not in kwargs:
-                self.id = str(uuid.uuid4())
+                init("id", str(uuid.uuid4()))
             if "created_at" not in kwargs:
-                self.created_at = datetime.now()
+                init("created_at", datetime.now())
             if "updated_at" not in kwargs:
-                self.updated_at = datetime.now()
+                init("updated_at", datetime.now())
         else:
-            self.id = str(uuid.uuid4())
-            self.created_at = self.updated_at = datetime.now()
+            init("id", str(uuid.uuid4()))
+            init("created_at", datetime.now())
+            init("updated_at", self.created_at)
+
+    def __setattr__(self, name, value):
+        """sets an attribute and tells storage the object changed
+        """
+        super().__setattr__(name, value)
+        if hasattr(models, "storage"):
+            models.storage.touch(self, name)
 
     def __str__(self):
         """returns a string
@@ -67,15 +80,23 @@ class BaseModel:
         models.storage.new(self)
         models.storage.save()
 
-    def to_dict(self, include_password=False):
+    def to_dict(self, include_password=False, fields=None):
         """creates dictionary of the class  and returns
+        Args:
+            include_password: keep the password hash in the dictionary
+            fields: optional names of the only keys to keep, id is
+                    always kept
         Return:
             returns a dictionary of all the key values in __dict__
         """
         my_dict = dict(self.__dict__)
         my_dict["__class__"] = str(type(self).__name__)
-        my_dict["created_at"] = self.created_at.isoformat()
-        my_dict["updated_at"] = self.updated_at.isoformat()
+        for key in ("created_at", "updated_at"):
+            if fields is None or key in fields:
+                my_dict[key] = getattr(self, key).isoformat()
+        if fields is not None:
+            my_dict = {key: value for key, value in my_dict.items()
+                       if key == "id" or key in fields}
         if '_sa_instance_state' in my_dict.keys():
             del my_dict['_sa_instance_state']
         if not include_password and 'password' in my_dict:
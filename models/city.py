@@ -2,10 +2,12 @@
 """This is the city class"""
 from sqlalchemy.ext.declarative import declarative_base
 from models.base_model import BaseModel, Base
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Index, Integer, String
 from sqlalchemy import ForeignKey
 from sqlalchemy.orm import relationship
 from models.place import Place
+from os import getenv
+import models
 
 
 class City(BaseModel, Base):
@@ -15,8 +17,22 @@ class City(BaseModel, Base):
         name: input name
     """
     __tablename__ = "cities"
-    __table_args__ = ({'mysql_default_charset': 'latin1'})
+    __table_args__ = (Index("ix_cities_state_id_created_at",
+                            "state_id", "created_at"),
+                      {'mysql_default_charset': 'latin1'})
     name = Column(String(128), nullable=False)
     state_id = Column(String(60), ForeignKey('states.id'), nullable=False)
-    places = relationship("Place", cascade='all, delete, delete-orphan',
-                          backref="cities")
+
+    if getenv("HBNB_TYPE_STORAGE") == "db":
+        places = relationship("Place", cascade='all, delete, delete-orphan',
+                              backref="cities")
+    else:
+        @property
+        def state(self):
+            """ Returns the state of the city """
+            return models.storage.get("State", self.state_id)
+
+        @property
+        def places(self):
+            """ Returns list of places in the city """
+            return models.storage.related("Place", "city_id", self.id)
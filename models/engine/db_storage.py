@@ -1,23 +1,99 @@
 #!/usr/bin/python3
 """ new class for sqlAlchemy """
 import models
+import random
+import threading
+import time
+from datetime import datetime, timedelta
 from os import getenv
-from sqlalchemy.orm import sessionmaker, scoped_session
-from sqlalchemy import (create_engine)
+from sqlalchemy.orm import (Session, joinedload, load_only, selectinload,
+                            sessionmaker, scoped_session)
+from sqlalchemy import event, inspect
+from sqlalchemy import (Column, DateTime, Delete, Index, Insert, Integer,
+                        String, Table, Update, and_, create_engine, func,
+                        literal, or_, select, union_all)
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.pool import QueuePool
 from models.base_model import Base
+from models.engine.events import Event, Listeners
 from models.state import State
 from models.city import City
 from models.user import User
-from models.place import Place
+from models.place import Place, place_amenity
 from models.review import Review
 from models.amenity import Amenity
 
 
+classes = {"State": State, "City": City, "User": User, "Place": Place,
+           "Review": Review, "Amenity": Amenity}
+
+tombstones = Table("tombstones", Base.metadata,
+                   Column("class_name", String(60), primary_key=True),
+                   Column("id", String(60), primary_key=True),
+                   Column("deleted_at", DateTime, nullable=False),
+                   Index("ix_tombstones_deleted_at", "deleted_at",
+                         "class_name", "id"))
+
+versions = Table("versions", Base.metadata,
+                 Column("class_name", String(60), primary_key=True),
+                 Column("version", Integer, nullable=False),
+                 Column("changed_at", DateTime, nullable=False))
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a connection
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the pool and its wait counters"""
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _do_get(self):
+        """Get a connection, timing the wait"""
+        start = time.monotonic()
+        try:
+            return super()._do_get()
+        finally:
+            wait = time.monotonic() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_total += wait
+                self.wait_max = max(self.wait_max, wait)
+
+
+class RoutingSession(Session):
+    """Session that reads from a replica and writes to the primary
+    info["replicas"]: engines of the replicas, none to use the primary
+    info["primary"]: set after a write so the rest of the session
+                     reads its own writes from the primary
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        """Return the engine for the next statement"""
+        replicas = self.info.get("replicas")
+        if not replicas or self._flushing or self.info.get("primary") or \
+                isinstance(clause, (Insert, Update, Delete)):
+            return super().get_bind(mapper, clause=clause, **kw)
+        if "replica" not in self.info:
+            self.info["replica"] = random.choice(replicas)
+        return self.info["replica"]
+
+
 class DBStorage:
-    """ create tables in environmental"""
+    """ create tables in environmental
+    Reads go to the hosts in HBNB_MYSQL_REPLICA_HOSTS (comma separated)
+    when it is set, writes always go to HBNB_MYSQL_HOST
+    """
+    __feed_lag = float(getenv("HBNB_MYSQL_FEED_LAG", "5"))
     __engine = None
+    __replicas = []
     __session = None
+    __listeners = Listeners()
 
     def __init__(self):
         """Initialize the DBStorage instance"""
@@ -26,24 +102,91 @@ class DBStorage:
         db = getenv("HBNB_MYSQL_DB")
         host = getenv("HBNB_MYSQL_HOST")
         env = getenv("HBNB_ENV")
+        replica_hosts = getenv("HBNB_MYSQL_REPLICA_HOSTS", "")
 
         self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'
                                       .format(user, passwd, host, db),
-                                      pool_pre_ping=True)
+                                      **self.__engine_options())
+        self.__replicas = [
+            create_engine('mysql+mysqldb://{}:{}@{}/{}'
+                          .format(user, passwd, replica.strip(), db),
+                          **self.__engine_options())
+            for replica in replica_hosts.split(",") if replica.strip()]
 
         if env == "test":
             Base.metadata.drop_all(self.__engine)
 
-    def all(self, cls=None):
+    @staticmethod
+    def __engine_options():
+        """returns the create_engine options set by the environment
+            HBNB_MYSQL_POOL_SIZE: connections kept open (default 10)
+            HBNB_MYSQL_MAX_OVERFLOW: extra connections allowed under
+                                     load (default 20)
+            HBNB_MYSQL_POOL_TIMEOUT: seconds to wait for a connection
+                                     (default 30)
+            HBNB_MYSQL_POOL_RECYCLE: seconds after which a connection is
+                                     replaced, -1 for never (default 3600)
+            HBNB_MYSQL_PRE_PING: "1" to ping connections on checkout,
+                                 "0" to rely on recycling (default 1)
+            HBNB_MYSQL_ISOLATION_LEVEL: e.g. "READ COMMITTED"
+        """
+        options = {
+            "poolclass": TimedQueuePool,
+            "pool_size": int(getenv("HBNB_MYSQL_POOL_SIZE", "10")),
+            "max_overflow": int(getenv("HBNB_MYSQL_MAX_OVERFLOW", "20")),
+            "pool_timeout": float(getenv("HBNB_MYSQL_POOL_TIMEOUT", "30")),
+            "pool_recycle": int(getenv("HBNB_MYSQL_POOL_RECYCLE", "3600")),
+            "pool_pre_ping": getenv("HBNB_MYSQL_PRE_PING", "1") == "1"
+        }
+        isolation_level = getenv("HBNB_MYSQL_ISOLATION_LEVEL")
+        if isolation_level:
+            options["isolation_level"] = isolation_level
+        return options
+
+    def pool_stats(self):
+        """returns the state of the connection pool
+        Return:
+            dictionary with the pool size, connections checked in and
+            out, overflow in use, and checkout count and wait times,
+            with the same for each replica under "replicas"
+        """
+        stats = self.__pool_stats(self.__engine.pool)
+        if self.__replicas:
+            stats["replicas"] = [self.__pool_stats(engine.pool)
+                                 for engine in self.__replicas]
+        return stats
+
+    @staticmethod
+    def __pool_stats(pool):
+        """returns the state of one connection pool
+        """
+        stats = {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0)
+        }
+        if isinstance(pool, TimedQueuePool):
+            stats["checkouts"] = pool.checkouts
+            stats["wait_total"] = pool.wait_total
+            stats["wait_max"] = pool.wait_max
+        return stats
+
+    def all(self, cls=None, with_related=()):
         """returns a dictionary
+        Args:
+            cls: optional class or class name to filter on
+            with_related: relationship paths of cls to load up front,
+                          e.g. ("cities", "cities.places")
         Return:
             returns a dictionary of __object
         """
         dic = {}
         if cls:
             if type(cls) is str:
-                cls = eval(cls)
-            query = self.__session.query(cls)
+                cls = classes[cls]
+            query = self.__session.query(cls).options(
+                *self.__loaders(cls, with_related))
             for elem in query:
                 key = "{}.{}".format(type(elem).__name__, elem.id)
                 dic[key] = elem
@@ -56,65 +199,503 @@ class DBStorage:
                     dic[key] = elem
         return (dic)
 
+    @staticmethod
+    def __columns(cls, fields, *always):
+        """returns the column attributes of cls named in fields or in
+        always, and id, so load_only is never given an empty list
+        """
+        return [attr for attr in inspect(cls).column_attrs
+                if attr.key in fields or attr.key in always or
+                attr.key == "id"]
+
+    @classmethod
+    def __load_only(cls, clase, fields, *always):
+        """returns the options loading only the columns of clase named
+        in fields, or no option when fields is None
+        """
+        if fields is None:
+            return []
+        columns = cls.__columns(clase, fields, *always)
+        return [load_only(*[getattr(clase, c.key) for c in columns])]
+
+    @staticmethod
+    def __loaders(cls, with_related, fields=None):
+        """returns the loader options for the relationship paths
+        Collections are loaded with selectinload and many-to-one
+        relationships with joinedload, so each path costs at most one
+        extra query whatever the number of rows. When fields is given
+        only those columns of the objects at the end of each path are
+        loaded
+        """
+        options = []
+        for path in with_related:
+            option = None
+            clase = cls
+            for name in path.split("."):
+                rel = inspect(clase).relationships[name]
+                attr = getattr(clase, name)
+                loader = selectinload if rel.uselist else joinedload
+                if option is None:
+                    option = loader(attr)
+                else:
+                    option = getattr(option, loader.__name__)(attr)
+                clase = rel.mapper.class_
+            if fields is not None:
+                option = option.load_only(*[
+                    getattr(clase, c.key)
+                    for c in DBStorage.__columns(clase, fields)])
+            options.append(option)
+        return options
+
+    def iter(self, cls=None, batch_size=1000, fields=None):
+        """iterate over objects without loading them all at once
+        Args:
+            cls: optional class or class name to iterate over
+            batch_size: number of rows fetched per round-trip
+            fields: optional names of the only columns to load
+        Return:
+            generator of objects, streamed from a server-side cursor
+        """
+        if cls is None:
+            lista = list(classes.values())
+        elif type(cls) is str:
+            lista = [classes[cls]]
+        else:
+            lista = [cls]
+        for clase in lista:
+            query = select(clase).options(
+                *self.__load_only(clase, fields)).execution_options(
+                yield_per=batch_size)
+            for elem in self.__session.scalars(query):
+                yield elem
+
+    def page(self, cls, limit, after=None, fields=None, **filters):
+        """returns objects of cls in (created_at, id) order
+        Args:
+            cls: a class or a class name string
+            limit: maximum number of objects to return
+            after: optional (created_at, id) to start after
+            fields: optional names of the only columns to load,
+                    created_at is always loaded for the cursor
+            filters: column values the objects must match
+        Return:
+            list of at most limit objects
+        """
+        if type(cls) is str:
+            cls = classes[cls]
+        query = self.__session.query(cls).options(
+            *self.__load_only(cls, fields, "created_at")).filter_by(**filters)
+        return self.__keyset(query, cls, limit, after).all()
+
+    def places_search(self, states=None, cities=None, amenities=None,
+                      limit=None, after=None, fields=None):
+        """returns places in (created_at, id) order
+        Args:
+            states: ids of states whose places are included
+            cities: ids of cities whose places are included
+            amenities: ids of amenities every place must have
+            limit: optional maximum number of places to return
+            after: optional (created_at, id) to start after
+            fields: optional names of the only columns to load,
+                    created_at is always loaded for the cursor
+        Return:
+            list of places; all places when states and cities are empty
+        """
+        query = self.__session.query(Place).options(
+            *self.__load_only(Place, fields, "created_at"))
+        if states or cities:
+            in_states = select(City.id).where(City.state_id.in_(states or []))
+            query = query.filter(or_(Place.city_id.in_(cities or []),
+                                     Place.city_id.in_(in_states)))
+        if amenities:
+            having = select(place_amenity.c.place_id).where(
+                place_amenity.c.amenity_id.in_(amenities)).group_by(
+                place_amenity.c.place_id).having(
+                func.count(place_amenity.c.amenity_id) == len(set(amenities)))
+            query = query.filter(Place.id.in_(having))
+        return self.__keyset(query, Place, limit, after).all()
+
+    def __keyset(self, query, cls, limit, after):
+        """orders query by (created_at, id), starting after after
+        """
+        if after:
+            created_at, id = after
+            query = query.filter(or_(
+                cls.created_at > created_at,
+                and_(cls.created_at == created_at, cls.id > id)))
+        return query.order_by(cls.created_at, cls.id).limit(limit)
+
+    def touch(self, obj, attr=None):
+        """nothing to do, the session tracks changed attributes
+        """
+        pass
+
+    def related(self, cls, attr, value):
+        """returns the objects of cls whose attr is value
+        """
+        if type(cls) is str:
+            cls = classes[cls]
+        return self.__session.query(cls).filter_by(**{attr: value}).all()
+
     def new(self, obj):
         """add a new element in the table
         """
+        self.__session.info["primary"] = True
         self.__session.add(obj)
 
+    def bulk_new(self, objs):
+        """add every obj of objs in the table
+        """
+        self.__session.info["primary"] = True
+        self.__session.add_all(objs)
+
+    def bulk_save(self, objs):
+        """add every obj of objs and commit them in one transaction
+        Objects of the same class are flushed as batched
+        executemany INSERTs
+        Return:
+            dictionary with the number of objects saved, the time it
+            took in seconds and the objects saved per second
+        """
+        start = time.monotonic()
+        objs = list(objs)
+        now = datetime.now()
+        for obj in objs:
+            obj.updated_at = now
+        self.bulk_new(objs)
+        self.save()
+        seconds = time.monotonic() - start
+        return {"count": len(objs), "seconds": seconds,
+                "per_second": len(objs) / seconds if seconds else None}
+
     def save(self):
         """save changes
         """
+        self.__session.info["primary"] = True
         self.__session.commit()
 
     def delete(self, obj=None):
         """delete an element in the table
         """
         if obj:
+            self.__session.info["primary"] = True
             self.__session.delete(obj)
 
     def reload(self):
         """configuration
+        __session is the scoped_session registry: every thread, and so
+        every request, gets its own session through it
         """
         Base.metadata.create_all(self.__engine)
-        sec = sessionmaker(bind=self.__engine, expire_on_commit=False)
-        Session = scoped_session(sec)
-        self.__session = Session()
+        try:
+            with self.__engine.begin() as conn:
+                present = set(conn.scalars(select(versions.c.class_name)))
+                missing = [name for name in classes if name not in present]
+                if missing:
+                    conn.execute(versions.insert(), [
+                        {"class_name": name, "version": 0,
+                         "changed_at": datetime.now()} for name in missing])
+        except IntegrityError:
+            # another process added them first
+            pass
+        sec = sessionmaker(bind=self.__engine, class_=RoutingSession,
+                           expire_on_commit=False,
+                           info={"replicas": self.__replicas})
+        event.listen(sec, "after_flush", self.__bury)
+        event.listen(sec, "after_flush", self.__written)
+        event.listen(sec, "after_flush", self.__collect)
+        event.listen(sec, "after_commit", self.__stamp)
+        event.listen(sec, "after_commit", self.__publish)
+        event.listen(sec, "after_rollback", self.__discard)
+        self.__session = scoped_session(sec)
+
+    def on_new(self, callback, queued=False):
+        """calls callback(event) for every object added, once committed
+        Args:
+            callback: function taking an Event
+            queued: call it from a worker thread instead of from the
+                    commit
+        """
+        self.__listeners.add("new", callback, queued)
+
+    def on_save(self, callback, queued=False):
+        """calls callback(event) for every object changed, once committed
+        """
+        self.__listeners.add("save", callback, queued)
+
+    def on_delete(self, callback, queued=False):
+        """calls callback(event) for every object deleted, once committed
+        """
+        self.__listeners.add("delete", callback, queued)
+
+    def remove_listener(self, callback):
+        """stops calling callback
+        """
+        self.__listeners.remove(callback)
+
+    def join_listeners(self):
+        """waits until the queued callbacks handled every event
+        """
+        self.__listeners.join()
+
+    @staticmethod
+    def __bury(session, flush_context):
+        """after_flush: records a tombstone for every deleted object, in
+        the same transaction, for changes(); the tombstone of an id
+        deleted before is replaced, the one of an id added again is
+        removed
+        """
+        ids = {}
+        for obj in list(session.deleted) + list(session.new):
+            ids.setdefault(type(obj).__name__, set()).add(obj.id)
+        c = tombstones.c
+        for name in sorted(ids):
+            session.execute(tombstones.delete().where(
+                c.class_name == name, c.id.in_(sorted(ids[name]))))
+        if session.deleted:
+            now = datetime.now()
+            session.execute(tombstones.insert(), [
+                {"class_name": type(obj).__name__, "id": obj.id,
+                 "deleted_at": now} for obj in session.deleted])
+
+    @staticmethod
+    def __written(session, flush_context):
+        """after_flush: remembers the classes the flush wrote to until
+        the transaction ends
+        """
+        session.info.setdefault("written", set()).update(
+            type(obj).__name__ for objs in
+            (session.new, session.dirty, session.deleted) for obj in objs)
+
+    def __stamp(self, session):
+        """after_commit: bumps the version of every class the
+        transaction wrote to, for version(), in a statement of its own
+        so that writers do not hold the versions rows until they commit
+        """
+        names = sorted(session.info.pop("written", ()))
+        if not names:
+            return
+        now = datetime.now()
+        with self.__engine.begin() as conn:
+            result = conn.execute(
+                versions.update().where(versions.c.class_name.in_(names))
+                .values(version=versions.c.version + 1, changed_at=now))
+            if result.rowcount == len(names):
+                return
+            present = set(conn.scalars(select(versions.c.class_name).where(
+                versions.c.class_name.in_(names))))
+        try:
+            with self.__engine.begin() as conn:
+                conn.execute(versions.insert(), [
+                    {"class_name": name, "version": 1, "changed_at": now}
+                    for name in names if name not in present])
+        except IntegrityError:
+            # another process added them first
+            pass
+
+    def changes(self, since=None, after=None, limit=100):
+        """returns what was saved since a time or after a cursor
+        Every table is read in updated_at order from its index and
+        deletes from the tombstones. updated_at is set before commit, so
+        changes newer than HBNB_MYSQL_FEED_LAG seconds are held back: a
+        transaction committing after a cursor went past its timestamp
+        would never be listed
+        Args:
+            since: optional datetime to start at
+            after: optional cursor of the last entry already seen
+            limit: maximum number of entries
+        Return:
+            (entries, False): entries are (cursor, op, class name, id,
+            obj) in (updated_at, class name, id) order, op is "put" or
+            "delete" and obj is None for deletes; an object changed
+            several times only shows at its last change
+        Raises:
+            ValueError: when after is not a cursor of this engine
+        """
+        entries = []
+        horizon = datetime.now() - timedelta(seconds=self.__feed_lag)
+        if after is not None:
+            if type(after) not in (list, tuple) or len(after) != 3 or \
+                    any(type(part) is not str for part in after):
+                raise ValueError("Invalid cursor")
+            stamp, after_name, after_id = after
+            stamp = datetime.fromisoformat(stamp)
+        for name, cls in classes.items():
+            query = select(cls).where(cls.updated_at <= horizon)
+            if after is not None:
+                same = cls.updated_at == stamp
+                if name == after_name:
+                    same = and_(same, cls.id > after_id)
+                elif name < after_name:
+                    same = literal(False)
+                query = query.where(or_(cls.updated_at > stamp, same))
+            elif since is not None:
+                query = query.where(cls.updated_at >= since)
+            query = query.order_by(cls.updated_at, cls.id).limit(limit)
+            for obj in self.__session.scalars(query):
+                entries.append(((obj.updated_at, name, obj.id), "put", obj))
+        c = tombstones.c
+        query = select(tombstones).where(c.deleted_at <= horizon)
+        if after is not None:
+            query = query.where(or_(
+                c.deleted_at > stamp,
+                and_(c.deleted_at == stamp, or_(
+                    c.class_name > after_name,
+                    and_(c.class_name == after_name, c.id > after_id)))))
+        elif since is not None:
+            query = query.where(c.deleted_at >= since)
+        query = query.order_by(c.deleted_at, c.class_name, c.id).limit(limit)
+        for row in self.__session.execute(query):
+            entries.append(((row.deleted_at, row.class_name, row.id),
+                            "delete", None))
+        entries.sort(key=lambda entry: entry[0])
+        return [((stamp.isoformat(), name, id), op, name, id, obj)
+                for (stamp, name, id), op, obj in entries[:limit]], False
+
+    @classmethod
+    def __collect(cls, session, flush_context):
+        """after_flush: remembers what the flush wrote until the
+        transaction ends, as {(class name, id): [op, fields, refs]}
+        """
+        if not cls.__listeners.active:
+            return
+        changes = session.info.setdefault("changes", {})
+        for op, objs in (("new", session.new), ("save", session.dirty),
+                         ("delete", session.deleted)):
+            for obj in objs:
+                state = inspect(obj)
+                fields = set()
+                refs = {}
+                for attr in state.mapper.column_attrs:
+                    history = state.attrs[attr.key].history
+                    if op == "new" and history.added or \
+                            op == "save" and history.has_changes():
+                        fields.add(attr.key)
+                    if attr.columns[0].foreign_keys:
+                        refs[attr.key] = set(history.sum()) - {None}
+                if op == "save" and not fields:
+                    continue
+                key = (type(obj).__name__, obj.id)
+                change = changes.get(key)
+                if change is None:
+                    changes[key] = [op, fields, refs]
+                    continue
+                if op == "delete":
+                    if change[0] == "new":
+                        del changes[key]
+                        continue
+                    change[0] = op
+                change[1] |= fields
+                for attr, values in refs.items():
+                    change[2].setdefault(attr, set()).update(values)
+
+    @classmethod
+    def __publish(cls, session):
+        """after_commit: emits the events of the committed changes
+        """
+        changes = session.info.pop("changes", None)
+        if changes:
+            cls.__listeners.emit([
+                Event(op, name, id,
+                      () if op == "delete" else tuple(sorted(fields)), refs)
+                for (name, id), (op, fields, refs) in changes.items()])
+
+    @staticmethod
+    def __discard(session):
+        """after_rollback: forgets the changes that were rolled back
+        """
+        session.info.pop("changes", None)
+        session.info.pop("written", None)
 
     def close(self):
         """ calls remove()
         """
-        self.__session.close()
+        self.__session.remove()
 
-    def get(self, cls, id):
+    def get(self, cls, id, with_related=(), fields=None,
+            related_fields=None):
         '''
             Retrieve an obj w/class name and id
+            with_related: relationship paths to load up front
+            fields: optional names of the only columns of obj to load
+            related_fields: optional names of the only columns of the
+                            related objects to load
         '''
-        result = None
-        try:
-            cls_object = getattr(models, cls)
-            objs = self.__session.query(cls_object).all()
-            for obj in objs:
-                if obj.id == id:
-                    result = obj
-                    break
-        except Exception as e:
-            print("Error:", e)  # this line is added to see exceptions raised
+        if type(cls) is str:
+            cls = classes.get(cls)
+        if cls is None or id is None:
+            return None
+        options = self.__load_only(cls, fields) + self.__loaders(
+            cls, with_related, related_fields)
+        return self.__session.get(cls, id, options=options)
+
+    def get_many(self, cls, ids, fields=None):
+        """returns the objects of cls with the given ids
+        Args:
+            cls: a class or a class name string
+            ids: iterable of ids
+            fields: optional names of the only columns to load
+        Return:
+            dictionary of id to object for the ids that exist, fetched
+            with WHERE id IN (...) queries of at most 1000 ids each
+        """
+        if type(cls) is str:
+            cls = classes[cls]
+        ids = list(set(ids))
+        result = {}
+        for i in range(0, len(ids), 1000):
+            query = self.__session.query(cls).options(
+                *self.__load_only(cls, fields)).filter(
+                cls.id.in_(ids[i:i + 1000]))
+            for obj in query:
+                result[obj.id] = obj
         return result
 
     def count(self, cls=None):
         '''
             Count num objects in DBstorage
         '''
-        cls_counter = 0
+        if cls is None:
+            return sum(self.counts().values())
+        if type(cls) is str:
+            cls = classes.get(cls)
+        if cls is None:
+            return 0
+        return self.__session.scalar(
+            select(func.count()).select_from(cls))
 
-        if cls is not None:
-            cls_obj = getattr(models, cls)
-            objs = self.__session.query(cls_obj).all()
-            cls_counter = len(objs)
-        else:
-            for k, v in models.__dict__.items():
-                if k != "BaseModel":
-                    cls_obj = getattr(models, k)
-                    objs = self.__session.query(cls_obj).all()
-                    cls_counter += len(objs)
-        return cls_counter
+    def version(self, cls, **filters):
+        '''
+            Validator of the objects of cls, for ETags
+            Args:
+                cls: a class or a class name string
+                filters: unused, every commit writing an object of cls
+                         changes the version of all of them
+            Return:
+                (tag, time of the last commit writing to cls or None),
+                from the counter of cls in the versions table, which
+                every commit writing to cls bumps right after it:
+                unlike timestamps, it changes with two writes in the
+                same second or a delete and an insert
+        '''
+        name = cls if type(cls) is str else cls.__name__
+        row = self.__session.execute(
+            select(versions.c.version, versions.c.changed_at).where(
+                versions.c.class_name == name)).one_or_none()
+        if row is None:
+            return "0", None
+        return "{}.{}".format(row.version, row.changed_at.isoformat()), \
+            row.changed_at if row.version else None
+
+    def counts(self):
+        '''
+            Count objects of every class in a single query
+            Return:
+                dictionary of class name to number of objects
+        '''
+        query = union_all(*[
+            select(literal(name).label("cls"),
+                   func.count().label("total")).select_from(cls)
+            for name, cls in classes.items()])
+        return {name: total
+                for name, total in self.__session.execute(query)}
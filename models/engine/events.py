@@ -0,0 +1,92 @@
+#!/usr/bin/python3
+"""Change events emitted by the storage engines"""
+import queue
+import threading
+import traceback
+from collections import namedtuple
+
+
+Event = namedtuple("Event", ["op", "class_name", "id", "changed_fields",
+                             "refs"])
+Event.__doc__ = """A change made durable by storage.save()
+    op: "new", "save" or "delete"
+    class_name: class name of the object
+    id: id of the object
+    changed_fields: names of the attributes set since the last save,
+                    every attribute for "new" and none for "delete"
+    refs: the old and new values of the reference attributes of the
+          object, {"state_id": {old, new}}, to find its parents
+"""
+
+OPS = ("new", "save", "delete")
+
+
+class Listeners:
+    """Registry of the callbacks of each op
+    Synchronous callbacks are called with the Event in the thread that
+    saved, right after the save or commit; queued callbacks are called
+    in order by a worker thread, so a slow one does not hold up writes
+    Attributes:
+        active: true when any callback is registered, checked by the
+                engines before doing any work for events
+    """
+
+    def __init__(self):
+        """Initialize an empty registry"""
+        self.active = False
+        self.__sync = {op: [] for op in OPS}
+        self.__queued = {op: [] for op in OPS}
+        self.__queue = None
+        self.__lock = threading.Lock()
+
+    def add(self, op, callback, queued=False):
+        """registers callback for the events of op
+        """
+        with self.__lock:
+            if queued and self.__queue is None:
+                self.__queue = queue.Queue()
+                threading.Thread(target=self.__work, daemon=True).start()
+            callbacks = self.__queued if queued else self.__sync
+            callbacks[op] = callbacks[op] + [callback]
+            self.active = True
+
+    def remove(self, callback):
+        """unregisters callback from every op
+        """
+        with self.__lock:
+            for callbacks in (self.__sync, self.__queued):
+                for op in OPS:
+                    callbacks[op] = [c for c in callbacks[op]
+                                     if c != callback]
+            self.active = any(self.__sync[op] or self.__queued[op]
+                              for op in OPS)
+
+    def emit(self, events):
+        """calls the synchronous callbacks and queues the events for
+        the queued ones
+        """
+        for event in events:
+            for callback in self.__sync[event.op]:
+                callback(event)
+            if self.__queued[event.op]:
+                self.__queue.put(event)
+
+    def join(self):
+        """waits until the queued callbacks handled every event
+        """
+        if self.__queue is not None:
+            self.__queue.join()
+
+    def __work(self):
+        """worker thread calling the queued callbacks
+        """
+        while True:
+            event = self.__queue.get()
+            try:
+                for callback in self.__queued[event.op]:
+                    try:
+                        callback(event)
+                    except Exception:
+                        traceback.print_exc()
+            finally:
+                self.__queue.task_done()
@@ -1,14 +1,30 @@
 #!/usr/bin/python3
 """This is the file storage class for AirBnB"""
+import fcntl
 import json
+import os
+import threading
+import time
+from datetime import datetime
+from bisect import bisect_left, bisect_right, insort
 from models.base_model import BaseModel
+from models.engine.events import Event, Listeners
 from models.user import User
 from models.state import State
 from models.city import City
 from models.amenity import Amenity
 from models.place import Place
 from models.review import Review
-import shlex
+from os import getenv
+
+
+classes = {"BaseModel": BaseModel, "User": User, "State": State,
+           "City": City, "Amenity": Amenity, "Place": Place,
+           "Review": Review}
+
+references = {"City": ("state_id",),
+              "Place": ("city_id", "user_id", "amenity_ids"),
+              "Review": ("place_id", "user_id")}
 
 
 class FileStorage:
@@ -17,27 +33,116 @@ class FileStorage:
     Attributes:
         __file_path: path to the JSON file
         __objects: objects will be stored
+        __by_class: the same objects grouped by class name,
+                    {class_name: {key: obj}}
+        __order: per class, a sorted list of (created_at, id)
+                 used for keyset pagination
+        __refs: reverse indexes on the attributes listed in references,
+                {(class_name, attr): {value: set of ids}}
+        __ref_values: the values each key is indexed under in __refs
+        __journal: when true, save appends the changes since the last
+                   save to __journal_path instead of rewriting the file
+        __journal_max: number of journal entries that triggers compact
+        __pending: keys changed since the last save, mapped to the
+                   object, or to None when it was deleted
+        __fragments: cached JSON of unchanged objects,
+                     {key: (JSON of key, JSON of to_dict(), to_dict())}
+        __stats: (mtime, size, inode) of the JSON file and the journal
+                 as last read or written, to skip reloads when neither
+                 changed
+        __fsync: when to fsync written files: "always", "never", or
+                 "batched" for at most once every __fsync_interval
+                 seconds
+        __unsynced: paths written but not fsynced yet in "batched"
+                    mode, fsynced by sync() from a timer
+        __epoch: identifies this process in the version() tags
+        __versions: per class, (number of changes, time of the last
+                    change) as returned by version()
+        __listeners: callbacks of the change events, see on_new()
+        __changes: changes since the last save, for the events,
+                   {key: [op, obj, set of attributes set, refs]}
+        __unlogged: keys changed since the last save, mapped to "put"
+                    or "delete", for the change feed
+        __feed: the change feed, a list of (seq, time, key, op) in seq
+                order; an entry is superseded by a later one of the same
+                key, deletes stay as tombstones. In journal mode the seq
+                of an object of the JSON file is its position minus the
+                number of objects, and that of a journal entry its byte
+                offset, so every process has the same feed
+        __feed_id: the feed cursors point into: __epoch, or in journal
+                   mode the generation of the JSON file, which changes
+                   when it is compacted
+        __journal_end: (inode, offset) of the journal up to which the
+                       feed was built, None for a missing journal
+        __feed_last: the seq of the last entry of each key in __feed
+        __feed_times: the time of each entry of __feed, never
+                      decreasing, to bisect on since
     """
     __file_path = "file.json"
+    __journal_path = "file.json.log"
+    __journal = getenv("HBNB_FILE_JOURNAL") == "1"
+    __journal_max = int(getenv("HBNB_FILE_JOURNAL_MAX", "10000"))
+    __journal_len = 0
+    __pending = {}
+    __fragments = {}
+    __stats = {}
+    __fsync = getenv("HBNB_FILE_FSYNC", "batched")
+    __fsync_interval = float(getenv("HBNB_FILE_FSYNC_INTERVAL", "1"))
+    __synced = 0.0
+    __unsynced = {}
+    __sync_lock = threading.Lock()
+    __sync_timer = None
     __objects = {}
+    __by_class = {}
+    __order = {}
+    __refs = {}
+    __ref_values = {}
+    __epoch = "{:x}".format(time.time_ns())
+    __versions = {}
+    __listeners = Listeners()
+    __changes = {}
+    __unlogged = {}
+    __feed = []
+    __feed_last = {}
+    __feed_times = []
+    __feed_id = __epoch
+    __journal_end = (None, 0)
+    __seq = 0
 
-    def all(self, cls=None):
+    @staticmethod
+    def _cls_name(cls):
+        """returns the class name of cls
+        Args:
+            cls: a class or a class name string
+        """
+        if type(cls) is str:
+            return cls
+        return cls.__name__
+
+    def all(self, cls=None, with_related=()):
         """returns a dictionary
+        Args:
+            cls: optional class or class name to filter on
+            with_related: unused, relationships are always in memory
         Return:
             returns a dictionary of __object
         """
-        dic = {}
         if cls:
-            dictionary = self.__objects
-            for key in dictionary:
-                partition = key.replace('.', ' ')
-                partition = shlex.split(partition)
-                if (partition[0] == cls.__name__):
-                    dic[key] = self.__objects[key]
-            return (dic)
+            return dict(self.__by_class.get(self._cls_name(cls), {}))
         else:
             return self.__objects
 
+    def iter(self, cls=None, batch_size=None, fields=None):
+        """returns an iterator over objects
+        Args:
+            cls: optional class or class name to iterate over
+            batch_size: unused, kept for parity with DBStorage
+            fields: unused, every attribute is already in memory
+        Return:
+            iterator over a snapshot of the objects
+        """
+        return iter(list(self.all(cls).values()))
+
     def new(self, obj):
         """sets __object to given obj
         Args:
@@ -45,25 +150,721 @@ class FileStorage:
         """
         if obj:
             key = "{}.{}".format(type(obj).__name__, obj.id)
+            if self.__listeners.active:
+                self.__record(
+                    "save" if key in self.__objects else "new", key, obj)
+            self.__add(key, obj)
+            self.__fragments.pop(key, None)
+            self.__unlogged[key] = "put"
+            self.__bump(type(obj).__name__)
+            if self.__journal:
+                self.__pending[key] = obj
+
+    def bulk_new(self, objs):
+        """sets __object to every obj of objs
+        Args:
+            objs: iterable of objects
+        """
+        names = set()
+        for obj in objs:
+            key = "{}.{}".format(type(obj).__name__, obj.id)
+            if self.__listeners.active:
+                self.__record(
+                    "save" if key in self.__objects else "new", key, obj)
+            self.__add(key, obj, keep_order=False)
+            self.__fragments.pop(key, None)
+            self.__unlogged[key] = "put"
+            if self.__journal:
+                self.__pending[key] = obj
+            names.add(type(obj).__name__)
+        for name in names:
+            self.__order[name].sort()
+            self.__bump(name)
+
+    def bulk_save(self, objs):
+        """adds every obj of objs and saves them with a single write
+        Args:
+            objs: iterable of objects
+        Return:
+            dictionary with the number of objects saved, the time it
+            took in seconds and the objects saved per second
+        """
+        start = time.monotonic()
+        objs = list(objs)
+        now = datetime.now()
+        for obj in objs:
+            obj.updated_at = now
+        self.bulk_new(objs)
+        self.save()
+        seconds = time.monotonic() - start
+        return {"count": len(objs), "seconds": seconds,
+                "per_second": len(objs) / seconds if seconds else None}
+
+    def __add(self, key, obj, keep_order=True):
+        """adds obj under key to __objects and the indexes
+        With keep_order false, the sorted index of the class is only
+        appended to and the caller must sort it
+        """
+        old = self.__objects.get(key)
+        if old is not obj:
+            if old is not None:
+                self.__unorder(old)
+            name = type(obj).__name__
             self.__objects[key] = obj
+            self.__by_class.setdefault(name, {})[key] = obj
+            order = self.__order.setdefault(name, [])
+            if keep_order:
+                insort(order, (obj.created_at, obj.id))
+            else:
+                order.append((obj.created_at, obj.id))
+        self.__ref(key, obj)
+
+    def __remove(self, key):
+        """removes key from __objects and the indexes
+        """
+        obj = self.__objects.pop(key)
+        self.__fragments.pop(key, None)
+        self.__by_class.get(type(obj).__name__, {}).pop(key, None)
+        self.__unorder(obj)
+        self.__unref(key)
+
+    def __bump(self, name):
+        """records a change to the objects of class name
+        """
+        version = self.__versions.get(name)
+        self.__versions[name] = (version[0] + 1 if version else 1,
+                                 time.time())
+
+    def version(self, cls, **filters):
+        """returns a validator of the objects of cls, for ETags
+        Args:
+            cls: a class or a class name string
+            filters: optional attribute values the objects must match
+        Return:
+            (tag, datetime of the last change to cls or None); without
+            filters the tag changes whenever an object of cls is added,
+            set or deleted, with filters it is the number of matching
+            objects and their latest updated_at, so it only changes
+            with them
+        """
+        name = self._cls_name(cls)
+        count, changed = self.__versions.get(name, (0, None))
+        changed = datetime.fromtimestamp(changed) if changed else None
+        if not filters:
+            return "{}.{}".format(self.__epoch, count), changed
+        if list(filters) == ["id"]:
+            obj = self.__objects.get("{}.{}".format(name, filters["id"]))
+            objs = [obj] if obj is not None else []
+        else:
+            objs = self.page(name, None, **filters)
+        latest = max((obj.updated_at for obj in objs), default=None)
+        return "{}.{}".format(len(objs), latest.isoformat()
+                              if latest else ""), changed
+
+    def touch(self, obj, attr=None):
+        """marks obj as changed so save serializes it again
+        Args:
+            obj: an object whose attributes were set
+            attr: optional name of the attribute that was set
+        """
+        id = obj.__dict__.get("id")
+        if id is None:
+            return
+        name = type(obj).__name__
+        key = "{}.{}".format(name, id)
+        self.__fragments.pop(key, None)
+        if self.__objects.get(key) is obj:
+            self.__bump(name)
+            self.__unlogged[key] = "put"
+            if self.__journal:
+                self.__pending[key] = obj
+            if self.__listeners.active:
+                self.__record("save", key, obj, attr)
+            if attr in references.get(name, ()):
+                self.__ref(key, obj)
+
+    def on_new(self, callback, queued=False):
+        """calls callback(event) for every object added, once saved
+        Args:
+            callback: function taking an Event
+            queued: call it from a worker thread instead of from save()
+        """
+        self.__listeners.add("new", callback, queued)
+
+    def on_save(self, callback, queued=False):
+        """calls callback(event) for every object changed, once saved
+        """
+        self.__listeners.add("save", callback, queued)
+
+    def on_delete(self, callback, queued=False):
+        """calls callback(event) for every object deleted, once saved
+        """
+        self.__listeners.add("delete", callback, queued)
+
+    def remove_listener(self, callback):
+        """stops calling callback
+        """
+        self.__listeners.remove(callback)
+
+    def join_listeners(self):
+        """waits until the queued callbacks handled every event
+        """
+        self.__listeners.join()
+
+    def __record(self, op, key, obj, attr=None):
+        """remembers a change of obj for the events of the next save,
+        with the reference values obj had before it
+        """
+        change = self.__changes.get(key)
+        if change is None:
+            old = self.__ref_values.get(key, {})
+            refs = {attr: set(old.get(attr, ()))
+                    for attr in references.get(type(obj).__name__, ())}
+            change = self.__changes[key] = [op, obj, set(), refs]
+        elif op == "delete" and change[0] == "new":
+            # never saved, nothing to tell
+            del self.__changes[key]
+            return
+        elif op != "save":
+            change[0] = "save" if change[0] == "delete" else op
+        change[1] = obj
+        if attr is not None:
+            change[2].add(attr)
+
+    def __emit(self):
+        """emits the events of the changes since the last save
+        """
+        events = []
+        for key, (op, obj, fields, refs) in self.__changes.items():
+            if op == "new":
+                fields = [k for k in obj.__dict__ if k != "_sa_instance_state"]
+            elif op == "delete":
+                fields = ()
+            for attr, values in refs.items():
+                value = getattr(obj, attr, None)
+                if op != "delete":
+                    values.update(value if type(value) is list else (value,))
+                values.discard(None)
+            events.append(Event(op, type(obj).__name__, obj.id,
+                                tuple(sorted(fields)), refs))
+        self.__changes.clear()
+        self.__listeners.emit(events)
+
+    def __fragment(self, key, obj):
+        """returns the cached JSON of key and obj, serializing obj
+        again only if it changed since the last call
+        """
+        fragment = self.__fragments.get(key)
+        if fragment is None:
+            record = obj.to_dict()
+            fragment = (json.dumps(key), json.dumps(record), record)
+            self.__fragments[key] = fragment
+        return fragment
+
+    def __unorder(self, obj):
+        """removes obj from the sorted index of its class
+        """
+        order = self.__order.get(type(obj).__name__, [])
+        i = bisect_left(order, (obj.created_at, obj.id))
+        if i < len(order) and order[i][1] == obj.id:
+            del order[i]
+        else:
+            # created_at was changed after obj was indexed
+            for i, entry in enumerate(order):
+                if entry[1] == obj.id:
+                    del order[i]
+                    break
+
+    def __ref(self, key, obj):
+        """(re)indexes obj under the current values of its references
+        """
+        attrs = references.get(type(obj).__name__)
+        if not attrs:
+            return
+        self.__unref(key)
+        values = {}
+        for attr in attrs:
+            value = getattr(obj, attr, None)
+            values[attr] = tuple(value) if type(value) is list else (value,)
+            index = self.__refs.setdefault((type(obj).__name__, attr), {})
+            for value in values[attr]:
+                if value is not None:
+                    index.setdefault(value, set()).add(obj.id)
+        self.__ref_values[key] = values
+
+    def __unref(self, key):
+        """removes key from the reverse indexes
+        """
+        values = self.__ref_values.pop(key, None)
+        if not values:
+            return
+        name, id = key.split('.', 1)
+        for attr, attr_values in values.items():
+            index = self.__refs.get((name, attr), {})
+            for value in attr_values:
+                ids = index.get(value)
+                if ids:
+                    ids.discard(id)
+                    if not ids:
+                        del index[value]
+
+    def related(self, cls, attr, value):
+        """returns the objects of cls whose attr is value
+        Args:
+            cls: a class or a class name string
+            attr: name of the attribute, e.g. "state_id"
+            value: value to look up
+        Return:
+            list of objects, from the reverse index when attr has one
+        """
+        name = self._cls_name(cls)
+        objs = self.__by_class.get(name, {})
+        if attr not in references.get(name, ()):
+            return [obj for obj in objs.values()
+                    if getattr(obj, attr, None) == value]
+        ids = self.__refs.get((name, attr), {}).get(value, ())
+        return [objs["{}.{}".format(name, id)] for id in ids]
+
+    def page(self, cls, limit, after=None, fields=None, **filters):
+        """returns objects of cls in (created_at, id) order
+        Args:
+            cls: a class or a class name string
+            limit: maximum number of objects to return
+            after: optional (created_at, id) to start after
+            fields: unused, every attribute is already in memory
+            filters: attribute values the objects must match
+        Return:
+            list of at most limit objects
+        """
+        name = self._cls_name(cls)
+        if len(filters) == 1:
+            (attr, value), = filters.items()
+            if attr in references.get(name, ()):
+                ids = self.__refs.get((name, attr), {}).get(value, ())
+                return self.__page_of(name, ids, limit, after)
+        order = self.__order.get(name, [])
+        objs = self.__by_class.get(name, {})
+        start = bisect_right(order, after) if after else 0
+        result = []
+        for i in range(start, len(order)):
+            obj = objs["{}.{}".format(name, order[i][1])]
+            if all(getattr(obj, k, None) == v for k, v in filters.items()):
+                result.append(obj)
+                if len(result) == limit:
+                    break
+        return result
+
+    def __page_of(self, name, ids, limit, after):
+        """returns a page of the objects of class name with the given ids
+        """
+        objs = self.__by_class.get(name, {})
+        order = sorted((objs["{}.{}".format(name, id)].created_at, id)
+                       for id in ids)
+        start = bisect_right(order, after) if after else 0
+        end = start + limit if limit else len(order)
+        return [objs["{}.{}".format(name, id)] for _, id in order[start:end]]
+
+    def places_search(self, states=None, cities=None, amenities=None,
+                      limit=None, after=None, fields=None):
+        """returns places in (created_at, id) order
+        Args:
+            states: ids of states whose places are included
+            cities: ids of cities whose places are included
+            amenities: ids of amenities every place must have
+            limit: optional maximum number of places to return
+            after: optional (created_at, id) to start after
+            fields: unused, every attribute is already in memory
+        Return:
+            list of places; all places when states and cities are empty
+        """
+        ids = None
+        if states or cities:
+            city_ids = set(cities or ())
+            by_state = self.__refs.get(("City", "state_id"), {})
+            for state_id in states or ():
+                city_ids |= by_state.get(state_id, set())
+            by_city = self.__refs.get(("Place", "city_id"), {})
+            ids = set()
+            for city_id in city_ids:
+                ids |= by_city.get(city_id, set())
+        by_amenity = self.__refs.get(("Place", "amenity_ids"), {})
+        for amenity_id in amenities or ():
+            having = by_amenity.get(amenity_id, set())
+            ids = set(having) if ids is None else ids & having
+        if ids is None:
+            return self.page(Place, limit, after)
+        return self.__page_of("Place", ids, limit, after)
 
     def save(self):
         """serialize the file path to JSON file path
+        In journal mode, only append the changes since the last save
+        """
+        if not self.__journal:
+            self.compact()
+        elif self.__pending:
+            self.__append()
+        if self.__journal and self.__journal_len >= self.__journal_max:
+            self.compact()
+        if self.__unlogged:
+            if not self.__journal:
+                for key, op in self.__unlogged.items():
+                    self.__log(key, op)
+            self.__unlogged.clear()
+        if self.__changes:
+            self.__emit()
+
+    def __append(self):
+        """appends the pending changes to the journal
+        They go to the feed when the journal ends where the feed does;
+        otherwise another process appended since the last reload, and
+        the next reload reads both
+        """
+        stamp = time.time()
+        with self.__open_journal() as f:
+            end = f.seek(0, os.SEEK_END)
+            if end:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    # a writer died mid-entry, end it so the entries
+                    # below are read
+                    f.write(b"\n")
+                    end += 1
+            stat = os.fstat(f.fileno())
+            known = self.__journal_end
+            current = known[1] == end and known[0] in (stat.st_ino, None) \
+                and self.__feed_id == self.__generation()
+            for key, obj in self.__pending.items():
+                if obj is None:
+                    line = '{{"op": "delete", "key": {}, "time": {}}}\n' \
+                        .format(json.dumps(key), stamp)
+                else:
+                    line = ('{{"op": "put", "key": {}, "time": {}, '
+                            '"value": {}}}\n').format(
+                        json.dumps(key), stamp,
+                        self.__fragment(key, obj)[1])
+                if current:
+                    self.__log(key, "delete" if obj is None else "put",
+                               end, stamp)
+                end += f.write(line.encode("UTF-8"))
+            synced = self.__sync(f)
+            stat = os.fstat(f.fileno())
+        if not synced:
+            self.__defer(self.__journal_path)
+        self.__journal_len += len(self.__pending)
+        self.__pending.clear()
+        if current:
+            self.__journal_end = (stat.st_ino, end)
+            self.__stats[self.__journal_path] = (
+                stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def __generation(self, stat=None):
+        """returns the generation of the JSON file, from its stat or
+        from the file, "" when it is missing
+        """
+        if stat is None:
+            try:
+                stat = os.stat(self.__file_path)
+            except FileNotFoundError:
+                return ""
+        return "{:x}.{:x}".format(stat.st_ino, stat.st_mtime_ns)
+
+    def __open_journal(self):
+        """opens the journal for appending, locked against the other
+        writers until it is closed
+        Return:
+            the journal opened in binary mode, reopened when another
+            writer compacted it while this one waited for the lock
+        """
+        while True:
+            f = open(self.__journal_path, 'a+b')
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                if os.stat(self.__journal_path).st_ino == \
+                        os.fstat(f.fileno()).st_ino:
+                    return f
+            except FileNotFoundError:
+                pass
+            f.close()
+
+    def __log(self, key, op, seq=None, stamp=None):
+        """appends a change of key to the feed, by default with the
+        next seq and the current time
+        """
+        if seq is None:
+            self.__seq += 1
+            seq = self.__seq
+        if stamp is None:
+            stamp = time.time()
+        if self.__feed_times and stamp < self.__feed_times[-1]:
+            # the clock went back
+            stamp = self.__feed_times[-1]
+        self.__feed.append((seq, stamp, key, op))
+        self.__feed_times.append(stamp)
+        self.__feed_last[key] = seq
+        if len(self.__feed) > 2 * len(self.__feed_last) + 1024:
+            # drop the superseded entries
+            self.__feed[:] = [entry for entry in self.__feed
+                              if self.__feed_last.get(entry[2]) == entry[0]]
+            self.__feed_times[:] = [entry[1] for entry in self.__feed]
+
+    def __start_feed(self, feed_id, keys):
+        """starts the feed of a new JSON file over, with the objects of
+        keys in the order of the file
+        """
+        del self.__feed[:], self.__feed_times[:]
+        self.__feed_last.clear()
+        FileStorage.__feed_id = feed_id
+        for i, key in enumerate(keys):
+            obj = self.__objects.get(key)
+            if obj is not None:
+                self.__log(key, "put", i - len(keys),
+                           obj.updated_at.timestamp())
+
+    def changes(self, since=None, after=None, limit=100):
+        """returns what was saved since a time or after a cursor
+        Args:
+            since: optional datetime to start at
+            after: optional cursor of the last entry already seen
+            limit: maximum number of entries
+        Return:
+            (entries, reset): entries are (cursor, op, class name, id,
+            obj) in save order, op is "put" or "delete" and obj is None
+            for deletes; an object changed several times only shows at
+            its last change. The feed starts again with every object
+            when the process restarts, or in journal mode when the
+            journal is compacted; reset is true when after is a cursor
+            from before
+        Raises:
+            ValueError: when after is not a cursor of this engine
+        """
+        reset = False
+        start = 0
+        if after is not None:
+            if type(after) not in (list, tuple) or len(after) != 2 or \
+                    type(after[0]) is not str or type(after[1]) is not int:
+                raise ValueError("Invalid cursor")
+            epoch, seq = after
+            if epoch == self.__feed_id:
+                start = bisect_right(self.__feed, (seq, float("inf")))
+            else:
+                reset = True
+        elif since is not None:
+            start = bisect_left(self.__feed_times, since.timestamp())
+        entries = []
+        for i in range(start, len(self.__feed)):
+            seq, _, key, op = self.__feed[i]
+            if self.__feed_last.get(key) != seq:
+                continue
+            obj = self.__objects.get(key) if op == "put" else None
+            if op == "put" and obj is None:
+                continue
+            name, id = key.split(".", 1)
+            entries.append(((self.__feed_id, seq), op, name, id, obj))
+            if len(entries) == limit:
+                break
+        return entries, reset
+
+    def compact(self):
+        """write every object to the JSON file and empty the journal
+        The file is written to a temporary file and renamed over the
+        old one, so readers never see a partly written file; in journal
+        mode the journal stays locked until it is removed
+        """
+        if not self.__journal:
+            self.__compact()
+            return
+        with self.__open_journal():
+            self.__compact()
+            self.__start_feed(self.__generation(), list(self.__objects))
+            self.__journal_end = (None, 0)
+
+    def __compact(self):
+        """writes the JSON file and removes the journal, see compact()
+        """
+        data = "{" + ", ".join(
+            "{}: {}".format(*self.__fragment(key, value)[:2])
+            for key, value in self.__objects.items()) + "}"
+        tmp_path = "{}.{}.{}.tmp".format(self.__file_path, os.getpid(),
+                                         threading.get_ident())
+        try:
+            with open(tmp_path, 'w', encoding="UTF-8") as f:
+                f.write(data)
+                synced = self.__sync(f)
+            os.replace(tmp_path, self.__file_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        if not synced:
+            self.__defer(self.__file_path)
+        if self.__fsync == "always":
+            self.__sync_dir()
+        try:
+            os.remove(self.__journal_path)
+        except FileNotFoundError:
+            pass
+        self.__journal_len = 0
+        self.__pending.clear()
+        self.__stats.update(self.__file_stats())
+
+    def __sync(self, f):
+        """fsyncs f according to the __fsync policy
+        Return:
+            false when f was written within __fsync_interval of the last
+            fsync in "batched" mode, and should be passed to __defer()
+            once in place
         """
-        my_dict = {}
-        for key, value in self.__objects.items():
-            my_dict[key] = value.to_dict()
-        with open(self.__file_path, 'w', encoding="UTF-8") as f:
-            json.dump(my_dict, f)
+        if self.__fsync == "never":
+            return True
+        if self.__fsync != "always" and \
+                time.monotonic() - self.__synced < self.__fsync_interval:
+            return False
+        f.flush()
+        os.fsync(f.fileno())
+        self.__synced = time.monotonic()
+        return True
+
+    def __defer(self, path):
+        """fsyncs path with sync() once __fsync_interval has passed
+        """
+        wait = self.__synced + self.__fsync_interval - time.monotonic()
+        with self.__sync_lock:
+            self.__unsynced[path] = True
+            if self.__sync_timer is None:
+                timer = threading.Timer(max(wait, 0), self.sync)
+                timer.daemon = True
+                FileStorage.__sync_timer = timer
+                timer.start()
+
+    def sync(self):
+        """fsyncs the files written but not fsynced yet
+        """
+        with self.__sync_lock:
+            if self.__sync_timer is not None:
+                self.__sync_timer.cancel()
+                FileStorage.__sync_timer = None
+            paths = list(self.__unsynced)
+            self.__unsynced.clear()
+        for path in paths:
+            try:
+                fd = os.open(path, os.O_RDONLY)
+            except FileNotFoundError:
+                continue
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        if paths:
+            self.__sync_dir()
+        self.__synced = time.monotonic()
+
+    def __sync_dir(self):
+        """fsyncs the directory of the JSON file so a rename is durable
+        """
+        fd = os.open(os.path.dirname(os.path.abspath(self.__file_path)),
+                     os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
 
     def reload(self):
         """serialize the file path to JSON file path
+        then replay the journal on top of it
+        Nothing is read when neither file changed since they were last
+        read or written and no object changed since the last save; an
+        object whose record did not change is kept with its cached JSON
         """
+        stats = self.__file_stats()
+        if stats == self.__stats and not self.__unlogged:
+            return
+        keys = []
+        generation = ""
         try:
             with open(self.__file_path, 'r', encoding="UTF-8") as f:
+                generation = self.__generation(os.fstat(f.fileno()))
                 for key, value in (json.load(f)).items():
-                    value = eval(value["__class__"])(**value)
-                    self.__objects[key] = value
+                    keys.append(key)
+                    obj = self.__load(key, value)
+                    if self.__objects.get(key) is obj:
+                        continue
+                    self.__bump(type(obj).__name__)
+                    self.__objects[key] = obj
+                    self.__by_class.setdefault(
+                        type(obj).__name__, {})[key] = obj
+                    self.__ref(key, obj)
+        except FileNotFoundError:
+            pass
+        for name, objs in self.__by_class.items():
+            self.__order[name] = sorted((obj.created_at, obj.id)
+                                        for obj in objs.values())
+        if self.__journal:
+            self.__start_feed(generation, keys)
+        self.__replay()
+        if not self.__journal:
+            for key in self.__objects:
+                if key not in self.__feed_last:
+                    self.__log(key, "put")
+        self.__stats.update(stats)
+
+    def __load(self, key, value):
+        """returns the object of the record value of key: the one in
+        memory if it was last saved as that same record, else a new one
+        """
+        obj = self.__objects.get(key)
+        fragment = self.__fragments.get(key)
+        if obj is not None and fragment is not None and fragment[2] == value:
+            return obj
+        self.__fragments.pop(key, None)
+        return classes[value["__class__"]](**value)
+
+    def __file_stats(self):
+        """returns the (mtime, size, inode) of the JSON file and of the
+        journal, None for a missing one
+        """
+        stats = {}
+        for path in (self.__file_path, self.__journal_path):
+            try:
+                stat = os.stat(path)
+                stats[path] = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+            except FileNotFoundError:
+                stats[path] = None
+        return stats
+
+    def __replay(self):
+        """applies the journal entries to __objects
+        An unfinished last entry, being written by another process or
+        left by a crash, and unreadable entries are skipped; the journal
+        is only repaired by writers, see save(). In journal mode the
+        entries go to the feed
+        """
+        self.__journal_len = 0
+        self.__journal_end = (None, 0)
+        try:
+            with open(self.__journal_path, 'rb') as f:
+                end = 0
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    seq = end
+                    end += len(line)
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    key = entry["key"]
+                    if entry["op"] == "put":
+                        obj = self.__load(key, entry["value"])
+                        if self.__objects.get(key) is not obj:
+                            self.__bump(type(obj).__name__)
+                        self.__add(key, obj)
+                    elif key in self.__objects:
+                        self.__bump(key.split(".", 1)[0])
+                        self.__remove(key)
+                    if self.__journal:
+                        self.__log(key, entry["op"], seq, entry.get("time"))
+                    self.__journal_len += 1
+                self.__journal_end = (os.fstat(f.fileno()).st_ino, end)
         except FileNotFoundError:
             pass
 
@@ -72,7 +873,64 @@ class FileStorage:
         """
         if obj:
             key = "{}.{}".format(type(obj).__name__, obj.id)
-            del self.__objects[key]
+            if self.__listeners.active:
+                self.__record("delete", key, obj)
+            self.__remove(key)
+            self.__unlogged[key] = "delete"
+            self.__bump(type(obj).__name__)
+            if self.__journal:
+                self.__pending[key] = None
+
+    def get(self, cls, id, with_related=(), fields=None,
+            related_fields=None):
+        """returns the object of class cls with the given id
+        Args:
+            cls: a class or a class name string
+            id: id of the object
+            with_related: unused, relationships are always in memory
+            fields: unused, every attribute is already in memory
+            related_fields: unused, like fields
+        Return:
+            the object, or None if it does not exist
+        """
+        key = "{}.{}".format(self._cls_name(cls), id)
+        return self.__objects.get(key)
+
+    def get_many(self, cls, ids, fields=None):
+        """returns the objects of cls with the given ids
+        Args:
+            cls: a class or a class name string
+            ids: iterable of ids
+            fields: unused, every attribute is already in memory
+        Return:
+            dictionary of id to object for the ids that exist
+        """
+        name = self._cls_name(cls)
+        result = {}
+        for id in ids:
+            obj = self.__objects.get("{}.{}".format(name, id))
+            if obj is not None:
+                result[id] = obj
+        return result
+
+    def count(self, cls=None):
+        """returns the number of objects in storage
+        Args:
+            cls: optional class or class name to count
+        Return:
+            the number of objects of cls, or of all objects
+        """
+        if cls:
+            return len(self.__by_class.get(self._cls_name(cls), {}))
+        return len(self.__objects)
+
+    def counts(self):
+        """returns the number of objects of every class
+        Return:
+            dictionary of class name to number of objects
+        """
+        return {name: len(self.__by_class.get(name, {}))
+                for name in classes}
 
     def close(self):
         """ calls reload()
@@ -2,7 +2,8 @@
 """This is the place class"""
 from sqlalchemy.ext.declarative import declarative_base
 from models.base_model import BaseModel, Base
-from sqlalchemy import Column, Table, String, Integer, Float, ForeignKey
+from sqlalchemy import (Column, Table, String, Integer, Float, ForeignKey,
+                        Index)
 from sqlalchemy.orm import relationship
 from os import getenv
 import models
@@ -35,7 +36,11 @@ class Place(BaseModel, Base):
         amenity_ids: list of Amenity ids
     """
     __tablename__ = "places"
-    __table_args__ = ({'mysql_default_charset': 'latin1'})
+    __table_args__ = (Index("ix_places_city_id_created_at",
+                            "city_id", "created_at"),
+                      Index("ix_places_user_id_created_at",
+                            "user_id", "created_at"),
+                      {'mysql_default_charset': 'latin1'})
     city_id = Column(String(60), ForeignKey("cities.id"), nullable=False)
     user_id = Column(String(60), ForeignKey("users.id"), nullable=False)
     name = Column(String(128), nullable=False)
@@ -56,29 +61,60 @@ class Place(BaseModel, Base):
                                  viewonly=False,
                                  back_populates="place_amenities")
     else:
+        def __init__(self, *args, **kwargs):
+            """ Instantiation of a place, with its own amenity ids """
+            super().__init__(*args, **kwargs)
+            if "amenity_ids" not in self.__dict__:
+                self.__dict__["amenity_ids"] = []
+
+        @property
+        def user(self):
+            """ Returns the user owning the place """
+            return models.storage.get("User", self.user_id)
+
         @property
         def reviews(self):
-            """ Returns list of reviews.id """
-            var = models.storage.all()
-            lista = []
-            result = []
-            for key in var:
-                review = key.replace('.', ' ')
-                review = shlex.split(review)
-                if (review[0] == 'Review'):
-                    lista.append(var[key])
-            for elem in lista:
-                if (elem.place_id == self.id):
-                    result.append(elem)
-            return (result)
+            """ Returns list of reviews of the place """
+            return models.storage.related("Review", "place_id", self.id)
 
         @property
         def amenities(self):
-            """ Returns list of amenity ids """
-            return self.amenity_ids
+            """ Returns list of amenities of the place """
+            return PlaceAmenities(self)
 
         @amenities.setter
         def amenities(self, obj=None):
             """ Appends amenity ids to the attribute """
-            if type(obj) is Amenity and obj.id not in self.amenity_ids:
-                self.amenity_ids.append(obj.id)
+            from models.amenity import Amenity
+            if type(obj) is Amenity:
+                PlaceAmenities(self).append(obj)
+
+
+class PlaceAmenities(list):
+    """This is the list of amenities of a place in file storage:
+    appending or removing one sets the amenity_ids of the place, so
+    storage saves and indexes the change
+    """
+
+    def __init__(self, place):
+        """Lists the amenities of place, in the order of its ids
+        """
+        amenities = models.storage.get_many("Amenity", place.amenity_ids)
+        super().__init__(amenities[id] for id in place.amenity_ids
+                         if id in amenities)
+        self.place = place
+
+    def append(self, amenity):
+        """Links amenity to the place
+        """
+        if amenity.id not in self.place.amenity_ids:
+            self.place.amenity_ids = self.place.amenity_ids + [amenity.id]
+        if amenity not in self:
+            super().append(amenity)
+
+    def remove(self, amenity):
+        """Unlinks amenity from the place
+        """
+        super().remove(amenity)
+        self.place.amenity_ids = [id for id in self.place.amenity_ids
+                                  if id != amenity.id]
@@ -2,7 +2,9 @@
 """This is the review class"""
 from sqlalchemy.ext.declarative import declarative_base
 from models.base_model import BaseModel, Base
-from sqlalchemy import Column, Integer, String, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, ForeignKey, Float, Index
+from os import getenv
+import models
 
 
 class Review(BaseModel, Base):
@@ -13,7 +15,22 @@ class Review(BaseModel, Base):
         text: review description
     """
     __tablename__ = "reviews"
-    __table_args__ = ({'mysql_default_charset': 'latin1'})
+    __table_args__ = (Index("ix_reviews_place_id_created_at",
+                            "place_id", "created_at"),
+                      Index("ix_reviews_user_id_created_at",
+                            "user_id", "created_at"),
+                      {'mysql_default_charset': 'latin1'})
     text = Column(String(1024), nullable=False)
     place_id = Column(String(60), ForeignKey("places.id"), nullable=False)
     user_id = Column(String(60), ForeignKey("users.id"), nullable=False)
+
+    if getenv("HBNB_TYPE_STORAGE") != "db":
+        @property
+        def place(self):
+            """ Returns the place reviewed """
+            return models.storage.get("Place", self.place_id)
+
+        @property
+        def user(self):
+            """ Returns the user who wrote the review """
+            return models.storage.get("User", self.user_id)
@@ -4,9 +4,9 @@ from sqlalchemy.ext.declarative import declarative_base
 from models.base_model import BaseModel, Base
 from sqlalchemy.orm import relationship
 from sqlalchemy import Column, Integer, String
+from os import getenv
 import models
 from models.city import City
-import shlex
 
 
 class State(BaseModel, Base):
@@ -17,20 +17,12 @@ class State(BaseModel, Base):
     __tablename__ = "states"
     __table_args__ = ({'mysql_default_charset': 'latin1'})
     name = Column(String(128), nullable=False)
-    cities = relationship("City", cascade='all, delete, delete-orphan',
-                          backref="state")
 
-    @property
-    def cities(self):
-        var = models.storage.all()
-        lista = []
-        result = []
-        for key in var:
-            city = key.replace('.', ' ')
-            city = shlex.split(city)
-            if (city[0] == 'City'):
-                lista.append(var[key])
-        for elem in lista:
-            if (elem.state_id == self.id):
-                result.append(elem)
-        return (result)
+    if getenv("HBNB_TYPE_STORAGE") == "db":
+        cities = relationship("City", cascade='all, delete, delete-orphan',
+                              backref="state")
+    else:
+        @property
+        def cities(self):
+            """ Returns list of cities of the state """
+            return models.storage.related("City", "state_id", self.id)
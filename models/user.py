@@ -2,11 +2,13 @@
 """This is the user class"""
 from sqlalchemy.ext.declarative import declarative_base
 from models.base_model import BaseModel, Base
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Index, Integer, String
 from sqlalchemy.orm import relationship
 from models.place import Place
 from models.review import Review
+from os import getenv
 import hashlib
+import models
 
 
 class User(BaseModel, Base):
@@ -19,16 +21,29 @@ class User(BaseModel, Base):
     """
 
     __tablename__ = "users"
-    __table_args__ = {"mysql_default_charset": "latin1"}
+    __table_args__ = (Index("ix_users_email", "email", unique=True),
+                      {"mysql_default_charset": "latin1"})
     email = Column(String(128), nullable=False)
     password = Column(String(128), nullable=False)
     first_name = Column(String(128))
     last_name = Column(String(128))
-    places = relationship("Place", cascade="all, delete, delete-orphan",
-                          backref="user")
-    reviews = relationship(
-        "Review", cascade="all, delete, delete-orphan", backref="user"
-    )
+
+    if getenv("HBNB_TYPE_STORAGE") == "db":
+        places = relationship("Place", cascade="all, delete, delete-orphan",
+                              backref="user")
+        reviews = relationship(
+            "Review", cascade="all, delete, delete-orphan", backref="user"
+        )
+    else:
+        @property
+        def places(self):
+            """Returns list of places owned by the user"""
+            return models.storage.related("Place", "user_id", self.id)
+
+        @property
+        def reviews(self):
+            """Returns list of reviews written by the user"""
+            return models.storage.related("Review", "user_id", self.id)
 
     def __init__(self, *args, **kwargs):
         """Instantiation of User class.
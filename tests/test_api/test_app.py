@@ -0,0 +1,50 @@
+#!/usr/bin/python3
+""" Module used to test the RESTful API app """
+
+import os
+import unittest
+from api.v1.app import app
+from models import storage
+from models.engine.file_storage import FileStorage
+
+
+@unittest.skipIf(os.getenv('HBNB_TYPE_STORAGE') == 'db', "FileStorage")
+class test_app(unittest.TestCase):
+    """ Test class for the API, with a client on an empty FileStorage """
+
+    def setUp(self):
+        """ Start from an empty storage """
+        for name, value in vars(FileStorage).items():
+            if name.startswith('_FileStorage__') and type(value) is dict:
+                value.clear()
+        self.client = app.test_client()
+
+    def tearDown(self):
+        """ Remove the storage files """
+        for path in ('file.json', 'file.json.log'):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def add(self, obj):
+        """ Save obj and return it """
+        storage.new(obj)
+        storage.save()
+        return obj
+
+    def test_status(self):
+        """ /status answers OK """
+        response = self.client.get('/api/v1/status')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), {"status": "OK"})
+
+    def test_not_found(self):
+        """ Unknown routes answer a JSON 404 """
+        response = self.client.get('/api/v1/nope')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.get_json(), {"error": "Not found"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+#!/usr/bin/python3
+""" Module used to test the response cache """
+
+import tempfile
+import unittest
+from unittest.mock import patch
+from tests.test_api.test_app import test_app
+from api.v1.cache import FileCache, MemoryCache
+from models import storage
+from models.engine.events import Event
+from models.state import State
+
+
+class test_memory_cache(unittest.TestCase):
+    """ Test class for MemoryCache """
+
+    def make(self, max_size=2, ttl=30):
+        """ Return an empty cache """
+        return MemoryCache(max_size, ttl)
+
+    def put(self, cache, key, tags):
+        """ Store a response under key, built from tags """
+        cache.set(key, tags, (200, [], key), cache.begin(tags))
+
+    def test_get(self):
+        """ A stored response is served until it is invalidated """
+        cache = self.make()
+        self.assertIsNone(cache.get("/a"))
+        self.put(cache, "/a", ["State"])
+        self.assertEqual(cache.get("/a"), (200, [], "/a"))
+        cache.invalidate(["City"])
+        self.assertEqual(cache.get("/a"), (200, [], "/a"))
+        cache.invalidate(["State"])
+        self.assertIsNone(cache.get("/a"))
+        self.assertEqual((cache.stats()["hits"], cache.stats()["misses"]),
+                         (2, 2))
+
+    def test_invalidate_event(self):
+        """ An event invalidates the tags of the object and its parents """
+        cache = self.make(max_size=10)
+        self.put(cache, "/states/a/cities", ["City.state_id=a"])
+        self.put(cache, "/states/b/cities", ["City.state_id=b"])
+        self.put(cache, "/cities/c", ["City.id=c"])
+        cache.invalidate_event(Event("save", "City", "x", ("state_id",),
+                                     {"state_id": {"a"}}))
+        self.assertIsNone(cache.get("/states/a/cities"))
+        self.assertIsNotNone(cache.get("/states/b/cities"))
+        self.assertIsNotNone(cache.get("/cities/c"))
+
+    def test_stale_set(self):
+        """ A response built before an invalidation is not stored """
+        cache = self.make()
+        token = cache.begin(["State"])
+        cache.invalidate(["State"])
+        cache.set("/a", ["State"], (200, [], "old"), token)
+        self.assertIsNone(cache.get("/a"))
+
+    def test_evict(self):
+        """ The least recently used response is evicted """
+        cache = self.make()
+        self.put(cache, "/a", ["State"])
+        self.put(cache, "/b", ["State"])
+        cache.get("/a")
+        self.put(cache, "/c", ["State"])
+        self.assertIsNone(cache.get("/b"))
+        self.assertIsNotNone(cache.get("/a"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_ttl(self):
+        """ A response is not served after its ttl """
+        cache = self.make(ttl=-1)
+        self.put(cache, "/a", ["State"])
+        self.assertIsNone(cache.get("/a"))
+
+
+class test_file_cache(test_memory_cache):
+    """ Test class for FileCache, with the tests of MemoryCache """
+
+    def setUp(self):
+        """ Use a fresh directory """
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """ Remove the directory """
+        self.dir.cleanup()
+
+    def make(self, max_size=2, ttl=30):
+        """ Return an empty cache """
+        return FileCache(self.dir.name, max_size, ttl)
+
+    def test_stale_set(self):
+        """ Responses built from stale tags are not served """
+        cache = self.make()
+        token = cache.begin(["State"])
+        cache.invalidate(["State"])
+        cache.set("/a", ["State"], (200, [], "old"), token)
+        self.assertIsNone(cache.get("/a"))
+
+    def test_evict(self):
+        """ Responses over max_size are evicted """
+        cache = self.make()
+        for key in ("/a", "/b", "/c"):
+            self.put(cache, key, ["State"])
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_shared(self):
+        """ An invalidation by another worker is seen """
+        cache = self.make()
+        self.put(cache, "/a", ["State"])
+        self.make().invalidate(["State"])
+        self.assertIsNone(cache.get("/a"))
+
+
+class test_cached_views(test_app):
+    """ Test class for the cached views """
+
+    def setUp(self):
+        """ Use a memory cache invalidated by storage events """
+        super().setUp()
+        self.cache = MemoryCache(100, 30)
+        patcher = patch('api.v1.views.helpers.response_cache', self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for on in (storage.on_new, storage.on_save, storage.on_delete):
+            on(self.cache.invalidate_event)
+        self.addCleanup(storage.remove_listener, self.cache.invalidate_event)
+        self.state = self.add(State(name="California"))
+
+    def test_hit_and_invalidate(self):
+        """ A view is served from the cache until its object changes """
+        url = '/api/v1/states/{}'.format(self.state.id)
+        self.assertEqual(self.client.get(url).get_json()["name"],
+                         "California")
+        self.assertEqual(self.client.get(url).get_json()["name"],
+                         "California")
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.client.put(url, json={"name": "Nevada"})
+        self.assertEqual(self.client.get(url).get_json()["name"], "Nevada")
+
+    def test_lists(self):
+        """ Full lists are cached until an object of the class changes """
+        for url in ('/api/v1/states', '/api/v1/amenities') * 2:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual((self.cache.stats()["hits"],
+                          self.cache.stats()["misses"]), (2, 2))
+        self.add(State(name="Nevada"))
+        response = self.client.get('/api/v1/states')
+        self.assertEqual(len(response.get_json()), 2)
+        self.assertEqual(self.cache.stats()["misses"], 3)
+
+    def test_streamed_without_cache(self):
+        """ Full lists are streamed when there is no cache """
+        with patch('api.v1.views.helpers.response_cache', None):
+            response = self.client.get('/api/v1/states')
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(len(response.get_json()), 1)
+        self.assertEqual(len(self.cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
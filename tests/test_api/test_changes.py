@@ -0,0 +1,42 @@
+#!/usr/bin/python3
+""" Module used to test the change feed endpoint """
+
+import json
+import unittest
+from base64 import urlsafe_b64encode
+from tests.test_api.test_app import test_app
+from models.state import State
+
+
+class test_changes(test_app):
+    """ Test class for the change feed endpoint """
+
+    def setUp(self):
+        """ Add a state """
+        super().setUp()
+        self.state = self.add(State(name="California"))
+
+    def test_resume(self):
+        """ The next cursor resumes after the last change """
+        response = self.client.get('/api/v1/changes?limit=10')
+        feed = response.get_json()
+        self.assertIn(self.state.id, [r["id"] for r in feed["results"]])
+        other = self.add(State(name="Nevada"))
+        response = self.client.get('/api/v1/changes?since=' + feed["next"])
+        self.assertEqual([r["id"] for r in response.get_json()["results"]],
+                         [other.id])
+
+    def test_invalid_since(self):
+        """ Malformed or forged cursors answer 400 """
+        cursors = [[], ["stale"], ["stale", "0"], [1, 2], ["a", "b", "c"]]
+        values = ["nope", "2017-13-01"] + [
+            urlsafe_b64encode(json.dumps(cursor).encode()).decode()
+            for cursor in cursors]
+        for value in values:
+            response = self.client.get('/api/v1/changes?since=' + value)
+            self.assertEqual(response.status_code, 400, value)
+            self.assertEqual(response.get_json(), {"error": "Invalid since"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+#!/usr/bin/python3
+""" Module used to test the cities endpoints """
+
+import unittest
+from base64 import urlsafe_b64encode
+from tests.test_api.test_app import test_app
+from models import storage
+from models.state import State
+from models.city import City
+
+
+class test_cities(test_app):
+    """ Test class for the cities endpoints """
+
+    def setUp(self):
+        """ Add a state with five cities """
+        super().setUp()
+        self.state = self.add(State(name="California"))
+        self.cities = [City(name=str(i), state_id=self.state.id)
+                       for i in range(5)]
+        storage.bulk_save(self.cities)
+
+    def test_cities_of_state(self):
+        """ The cities of a state are listed """
+        response = self.client.get(
+            '/api/v1/states/{}/cities'.format(self.state.id))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(c["name"] for c in response.get_json()),
+                         ["0", "1", "2", "3", "4"])
+
+    def test_cities_of_state_paged(self):
+        """ ?limit= pages the cities of a state """
+        url = '/api/v1/states/{}/cities?limit=2'.format(self.state.id)
+        names = []
+        while url:
+            page = self.client.get(url).get_json()
+            self.assertLessEqual(len(page["results"]), 2)
+            names.extend(c["name"] for c in page["results"])
+            url = page["next"] and '/api/v1/states/{}/cities?limit=2' \
+                '&cursor={}'.format(self.state.id, page["next"])
+        self.assertEqual(sorted(names), ["0", "1", "2", "3", "4"])
+
+    def test_invalid_cursor(self):
+        """ Malformed cursors and cursors with a timezone answer 400 """
+        for raw in ("nope", "2020-01-01T00:00:00|x|y",
+                    "2020-01-01T00:00:00+00:00|x"):
+            cursor = urlsafe_b64encode(raw.encode()).decode()
+            for url in ('/api/v1/states/{}/cities'.format(self.state.id),
+                        '/api/v1/states'):
+                response = self.client.get(
+                    url + '?limit=2&cursor=' + cursor)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.get_json(),
+                                 {"error": "Invalid cursor"})
+
+    def test_cities_of_missing_state(self):
+        """ A missing state answers 404, paged or not """
+        for query in ('', '?limit=2'):
+            response = self.client.get('/api/v1/states/nope/cities' + query)
+            self.assertEqual(response.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
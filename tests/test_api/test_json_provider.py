@@ -0,0 +1,109 @@
+#!/usr/bin/python3
+""" Module used to test the JSON providers of the API """
+
+import json
+import os
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+from flask import Flask
+from api.v1.json_provider import (CompactJSONProvider, ORJSONProvider,
+                                  json_provider_class, orjson)
+
+
+class test_compact_provider(unittest.TestCase):
+    """ Test class for CompactJSONProvider """
+
+    provider_class = CompactJSONProvider
+
+    def setUp(self):
+        """ Build the provider on its own app """
+        self.app = Flask(__name__)
+        self.provider = self.provider_class(self.app)
+
+    def test_parity(self):
+        """ The output reads back as the standard library output """
+        now = datetime(2017, 9, 28, 21, 5, 54, 119427)
+        obj = [{"name": "Café", "price": 12.5, "rooms": 3, "ok": True,
+                "none": None, "ids": ["a", "b"], "created_at": now}]
+        expected = json.loads(json.dumps(obj, default=str).replace(
+            str(now), now.isoformat()))
+        self.assertEqual(json.loads(self.provider.dumps(obj)), expected)
+        self.assertEqual(self.provider.loads(self.provider.dumps(obj)),
+                         expected)
+
+    def test_compact_unsorted(self):
+        """ Keys keep their order and there are no spaces """
+        self.assertEqual(self.provider.dumps({"b": 1, "a": [1, 2]}),
+                         '{"b":1,"a":[1,2]}')
+
+    def test_kwargs(self):
+        """ Standard library options such as sort_keys still apply """
+        self.assertEqual(self.provider.dumps({"b": 1, "a": 2},
+                                             sort_keys=True),
+                         '{"a":2,"b":1}')
+
+    def test_response(self):
+        """ Responses carry the same JSON """
+        with self.app.app_context():
+            response = self.provider.response({"b": 1, "a": 2})
+        self.assertEqual(response.mimetype, "application/json")
+        self.assertEqual(json.loads(response.get_data()), {"b": 1, "a": 2})
+
+    def test_unknown_type(self):
+        """ Values JSON does not know about raise TypeError """
+        with self.assertRaises(TypeError):
+            self.provider.dumps({"a": object()})
+
+
+@unittest.skipIf(orjson is None, "orjson is not installed")
+class test_orjson_provider(test_compact_provider):
+    """ Test class for ORJSONProvider, with the tests of the compact one """
+
+    provider_class = ORJSONProvider
+
+    def test_same_output(self):
+        """ orjson writes the same string as the compact provider """
+        obj = [{"id": "a", "name": "Café", "latitude": 37.77,
+                "created_at": datetime(2017, 9, 28, 21, 5, 54, 119427)}]
+        self.assertEqual(self.provider.dumps(obj),
+                         CompactJSONProvider(self.app).dumps(obj))
+
+
+class test_json_provider_class(unittest.TestCase):
+    """ Test class for json_provider_class """
+
+    def backend(self, value):
+        """ Set HBNB_API_JSON to value, or unset it for None """
+        env = {k: v for k, v in os.environ.items() if k != "HBNB_API_JSON"}
+        if value is not None:
+            env["HBNB_API_JSON"] = value
+        patcher = patch.dict(os.environ, env, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_json(self):
+        """ HBNB_API_JSON=json picks the standard library """
+        self.backend("json")
+        self.assertIs(json_provider_class(), CompactJSONProvider)
+
+    @unittest.skipIf(orjson is None, "orjson is not installed")
+    def test_orjson(self):
+        """ orjson is picked when asked for or when unset """
+        for value in ("orjson", None):
+            self.backend(value)
+            self.assertIs(json_provider_class(), ORJSONProvider)
+
+    @patch('api.v1.json_provider.orjson', None)
+    def test_without_orjson(self):
+        """ Without orjson the standard library is used when unset, and
+        asking for orjson raises ImportError """
+        self.backend(None)
+        self.assertIs(json_provider_class(), CompactJSONProvider)
+        self.backend("orjson")
+        with self.assertRaises(ImportError):
+            json_provider_class()
+
+
+if __name__ == "__main__":
+    unittest.main()
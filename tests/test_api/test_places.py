@@ -0,0 +1,134 @@
+#!/usr/bin/python3
+""" Module used to test the places endpoints """
+
+import unittest
+from tests.test_api.test_app import test_app
+from models import storage
+from models.state import State
+from models.city import City
+from models.place import Place
+from models.user import User
+
+
+class test_places(test_app):
+    """ Test class for the places endpoints """
+
+    def setUp(self):
+        """ Add a state with a city and a place """
+        super().setUp()
+        self.state = self.add(State(name="California"))
+        self.city = self.add(City(name="Page", state_id=self.state.id))
+        self.user = self.add(User(email="a@b.c", password="pwd"))
+        self.place = self.add(Place(name="Home", city_id=self.city.id,
+                                    user_id=self.user.id))
+
+    def test_batch_create(self):
+        """ Each item is created or gets its own error """
+        response = self.client.post('/api/v1/places/batch', json=[
+            {"city_id": self.city.id, "user_id": self.user.id,
+             "name": "a"},
+            {"city_id": "nope", "user_id": self.user.id, "name": "b"},
+            {"city_id": self.city.id, "user_id": self.user.id},
+            "x",
+            {"city_id": [1], "user_id": self.user.id, "name": "d"},
+            {"city_id": self.city.id, "user_id": self.user.id,
+             "name": "e", "number_rooms": "many"},
+            {"city_id": self.city.id, "user_id": self.user.id,
+             "name": "f", "reviews": []}])
+        self.assertEqual(response.status_code, 200)
+        results = response.get_json()
+        self.assertEqual([r["status"] for r in results],
+                         [201, 404, 400, 400, 400, 400, 400])
+        self.assertEqual([r.get("error") for r in results[2:]],
+                         ["Missing name", "Not a JSON", "Invalid city_id",
+                          "Invalid number_rooms", "Invalid reviews"])
+        self.assertEqual(storage.count(Place), 2)
+
+    def test_batch_create_ignores_id_and_dates(self):
+        """ id, created_at and updated_at of the items are ignored """
+        response = self.client.post('/api/v1/places/batch', json=[
+            {"city_id": self.city.id, "user_id": self.user.id,
+             "name": "Other", "id": self.place.id, "created_at": "bad",
+             "updated_at": "bad", "__class__": "User"}])
+        result, = response.get_json()
+        self.assertEqual(result["status"], 201)
+        self.assertNotEqual(result["place"]["id"], self.place.id)
+        self.assertEqual(storage.get(Place, self.place.id).name, "Home")
+        self.assertEqual(storage.count(Place), 2)
+
+    def test_batch_update(self):
+        """ Each item is updated or gets its own error """
+        response = self.client.patch('/api/v1/places/batch', json=[
+            {"id": self.place.id, "name": "Cabin"},
+            {"id": "nope", "name": "x"},
+            {"id": self.place.id, "max_guest": "two"}])
+        self.assertEqual([r["status"] for r in response.get_json()],
+                         [200, 404, 400])
+        place = storage.get(Place, self.place.id)
+        self.assertEqual(place.name, "Cabin")
+        self.assertNotEqual(place.max_guest, "two")
+
+    def test_batch_null(self):
+        """ null for a NOT NULL column is rejected per item """
+        response = self.client.post('/api/v1/places/batch', json=[
+            {"city_id": self.city.id, "user_id": self.user.id,
+             "name": None},
+            {"city_id": self.city.id, "user_id": self.user.id,
+             "name": "a", "description": None}])
+        self.assertEqual([r["status"] for r in response.get_json()],
+                         [400, 201])
+        self.assertEqual(response.get_json()[0]["error"], "Invalid name")
+        response = self.client.patch('/api/v1/places/batch', json=[
+            {"id": self.place.id, "number_rooms": None},
+            {"id": self.place.id, "name": "Cabin"}])
+        self.assertEqual([r["status"] for r in response.get_json()],
+                         [400, 200])
+        self.assertEqual(response.get_json()[0]["error"],
+                         "Invalid number_rooms")
+
+    def test_batch_update_city(self):
+        """ A new city_id must be the id of a city """
+        other = self.add(City(name="Fresno", state_id=self.state.id))
+        response = self.client.patch('/api/v1/places/batch', json=[
+            {"id": self.place.id, "city_id": "nope"},
+            {"id": self.place.id, "city_id": other.id}])
+        self.assertEqual([r["status"] for r in response.get_json()],
+                         [404, 200])
+        self.assertEqual(storage.get(Place, self.place.id).city_id,
+                         other.id)
+
+    def test_get_by_ids(self):
+        """ Places are returned in the order of ?ids= or of the body """
+        other = self.add(Place(name="Other", city_id=self.city.id,
+                               user_id=self.user.id))
+        ids = [other.id, "nope", self.place.id]
+        response = self.client.get('/api/v1/places?ids=' + ",".join(ids))
+        self.assertEqual([p["id"] for p in response.get_json()],
+                         [other.id, self.place.id])
+        response = self.client.post('/api/v1/places/lookup',
+                                    json={"ids": ids})
+        self.assertEqual([p["id"] for p in response.get_json()],
+                         [other.id, self.place.id])
+        response = self.client.get('/api/v1/places')
+        self.assertEqual(response.status_code, 400)
+
+    def test_places_search(self):
+        """ places_search finds the places of a state """
+        response = self.client.post('/api/v1/places_search',
+                                    json={"states": [self.state.id]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([p["id"] for p in response.get_json()],
+                         [self.place.id])
+
+    def test_places_search_not_list(self):
+        """ places_search answers 400 unless given lists of ids """
+        for search in ({"states": self.state.id}, {"cities": [1]},
+                       {"amenities": {"a": 1}}):
+            response = self.client.post('/api/v1/places_search',
+                                        json=search)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.get_json(), {"error": "Not a list"})
+
+
+if __name__ == "__main__":
+    unittest.main()
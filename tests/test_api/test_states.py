@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+""" Module used to test the states endpoints """
+
+import unittest
+from tests.test_api.test_app import test_app
+from models.state import State
+
+
+class test_states(test_app):
+    """ Test class for the states endpoints """
+
+    def setUp(self):
+        """ Add a state """
+        super().setUp()
+        self.state = self.add(State(name="California"))
+
+    def test_fields(self):
+        """ ?fields= keeps only the given fields and id """
+        for url in ('/api/v1/states?fields=name',
+                    '/api/v1/states/{}?fields=name'.format(self.state.id)):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            state = response.get_json()
+            if type(state) is list:
+                state, = state
+            self.assertEqual(state, {"id": self.state.id,
+                                     "name": "California"})
+
+    def test_fields_unknown_or_empty(self):
+        """ Unknown or no fields leave only the id """
+        for query in ('?fields=foo', '?fields=', '?fields=,'):
+            for url in ('/api/v1/states',
+                        '/api/v1/states/{}'.format(self.state.id)):
+                response = self.client.get(url + query)
+                self.assertEqual(response.status_code, 200)
+                state = response.get_json()
+                if type(state) is list:
+                    state, = state
+                self.assertEqual(state, {"id": self.state.id})
+
+    def test_etag(self):
+        """ A current If-None-Match answers 304, a stale one 200 """
+        url = '/api/v1/states/{}'.format(self.state.id)
+        etag = self.client.get(url).headers["ETag"]
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.client.put(url, json={"name": "Nevada"})
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["name"], "Nevada")
+
+    def test_etag_nested(self):
+        """ The cities of a state keep their ETag when another state's
+        cities change """
+        other = self.add(State(name="Nevada"))
+        url = '/api/v1/states/{}/cities'.format(self.state.id)
+        etag = self.client.get(url).headers["ETag"]
+        self.client.post('/api/v1/states/{}/cities'.format(other.id),
+                         json={"name": "Reno"})
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.client.post(url, json={"name": "Page"})
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_if_modified_since(self):
+        """ If-Modified-Since answers 304 from Last-Modified on """
+        url = '/api/v1/states'
+        last_modified = self.client.get(url).headers["Last-Modified"]
+        response = self.client.get(
+            url, headers={"If-Modified-Since": last_modified})
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(url, headers={
+            "If-Modified-Since": "Sat, 01 Jan 2000 00:00:00 GMT"})
+        self.assertEqual(response.status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -77,6 +77,14 @@ class test_basemodel(unittest.TestCase):
         n = i.to_dict()
         self.assertEqual(i.to_dict(), n)
 
+    @unittest.skipIf(os.getenv('HBNB_TYPE_STORAGE') == 'db', "FileStorage")
+    def test_todict_fields(self):
+        """ to_dict keeps only the given fields and id """
+        i = self.value()
+        n = i.to_dict(fields=("created_at", "nope"))
+        self.assertEqual(n, {"id": i.id,
+                             "created_at": i.created_at.isoformat()})
+
     @unittest.skipIf(os.getenv('HBNB_TYPE_STORAGE') == 'db', "FileStorage")
     def test_kwargs_none(self):
         """ """
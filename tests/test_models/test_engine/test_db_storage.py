@@ -2,8 +2,11 @@
 """ Test module for the Database storage"""
 
 import unittest
+from unittest.mock import patch
 import pycodestyle
-from models.engine.db_storage import DBStorage
+from sqlalchemy import create_engine, select
+from models.engine.db_storage import DBStorage, RoutingSession, versions
+from models.state import State
 
 
 class TestDBStorage(unittest.TestCase):
@@ -25,6 +28,136 @@ class TestDBStorage(unittest.TestCase):
         self.assertIsNotNone(DBStorage.delete.__doc__)
         self.assertIsNotNone(DBStorage.reload.__doc__)
 
+    def test_engine_options(self):
+        """Pool settings are read from the environment"""
+        env = {"HBNB_MYSQL_POOL_SIZE": "5", "HBNB_MYSQL_MAX_OVERFLOW": "2",
+               "HBNB_MYSQL_PRE_PING": "0",
+               "HBNB_MYSQL_ISOLATION_LEVEL": "READ COMMITTED"}
+        with patch.dict("os.environ", env):
+            options = DBStorage._DBStorage__engine_options()
+        self.assertEqual(options["pool_size"], 5)
+        self.assertEqual(options["max_overflow"], 2)
+        self.assertFalse(options["pool_pre_ping"])
+        self.assertEqual(options["isolation_level"], "READ COMMITTED")
+
+    def test_engine_options_default(self):
+        """Pool settings have defaults"""
+        with patch.dict("os.environ", {}, clear=True):
+            options = DBStorage._DBStorage__engine_options()
+        self.assertEqual(options["pool_size"], 10)
+        self.assertEqual(options["pool_recycle"], 3600)
+        self.assertTrue(options["pool_pre_ping"])
+        self.assertNotIn("isolation_level", options)
+
+    def test_routing_session(self):
+        """Reads go to a replica until the session writes"""
+        primary = create_engine("sqlite://")
+        replica = create_engine("sqlite://")
+        session = RoutingSession(bind=primary, info={"replicas": [replica]})
+        self.assertIs(session.get_bind(State, clause=select(State)),
+                      replica)
+        session.info["primary"] = True
+        self.assertIs(session.get_bind(State, clause=select(State)),
+                      primary)
+
+    def test_routing_session_no_replicas(self):
+        """Without replicas everything goes to the primary"""
+        primary = create_engine("sqlite://")
+        session = RoutingSession(bind=primary)
+        self.assertIs(session.get_bind(State, clause=select(State)),
+                      primary)
+
+    def sqlite_storage(self):
+        """Return a DBStorage on an empty in-memory sqlite database"""
+        engine = create_engine("sqlite://")
+        with patch("models.engine.db_storage.create_engine",
+                   return_value=engine):
+            storage = DBStorage()
+        storage.reload()
+        self.addCleanup(storage.close)
+        return storage
+
+    @patch.object(DBStorage, '_DBStorage__feed_lag', 0)
+    def test_tombstones(self):
+        """An id deleted, added again and deleted again has one tombstone"""
+        storage = self.sqlite_storage()
+        state = State(name="California")
+        for _ in range(2):
+            storage.new(State(name=state.name, id=state.id))
+            storage.save()
+            storage.delete(storage.get(State, state.id))
+            storage.save()
+        entries, reset = storage.changes()
+        self.assertEqual([(op, id) for _, op, _, id, _ in entries],
+                         [("delete", state.id)])
+        storage.new(State(name=state.name, id=state.id))
+        storage.save()
+        entries, reset = storage.changes()
+        self.assertEqual([(op, id) for _, op, _, id, _ in entries],
+                         [("put", state.id)])
+
+    def test_version_after_commit(self):
+        """The version is bumped after commit, outside the transaction"""
+        storage = self.sqlite_storage()
+        before = storage.version(State)[0]
+        storage.new(State(name="California"))
+        storage._DBStorage__session.flush()
+        self.assertEqual(storage.version(State)[0], before)
+        storage.save()
+        self.assertNotEqual(storage.version(State)[0], before)
+        with storage._DBStorage__engine.begin() as conn:
+            conn.execute(versions.delete())
+        storage.new(State(name="Nevada"))
+        storage.save()
+        self.assertTrue(storage.version(State)[0].startswith("1."))
+
+    def test_changes_lag(self):
+        """Changes younger than the feed lag are held back"""
+        storage = self.sqlite_storage()
+        storage.new(State(name="California"))
+        storage.save()
+        with patch.object(DBStorage, '_DBStorage__feed_lag', 60):
+            self.assertEqual(storage.changes(), ([], False))
+        with patch.object(DBStorage, '_DBStorage__feed_lag', 0):
+            self.assertEqual(len(storage.changes()[0]), 1)
+
+    def test_changes_invalid_cursor(self):
+        """changes() raises ValueError on cursors it did not make"""
+        storage = self.sqlite_storage()
+        for after in ([], ("stale", "0"), ["a", "b", 1], ["a", "b", "c"]):
+            with self.assertRaises(ValueError):
+                storage.changes(after=after)
+
+    def test_get_fields(self):
+        """Only the asked columns are loaded, always with the id"""
+        storage = self.sqlite_storage()
+        state = State(name="California")
+        storage.new(state)
+        storage.save()
+        storage.close()
+        for fields in (("foo",), (), ("name",)):
+            obj = storage.get(State, state.id, fields=fields)
+            self.assertEqual(obj.to_dict(fields=fields)["id"], state.id)
+            storage.close()
+
+    def test_version(self):
+        """The version changes with every write to the class"""
+        storage = self.sqlite_storage()
+        state = State(name="California")
+        storage.new(state)
+        storage.save()
+        tags = [storage.version(State)[0]]
+        for name in ("Nevada", "Oregon"):
+            state.name = name
+            storage.save()
+            tags.append(storage.version(State)[0])
+        storage.delete(state)
+        storage.new(State(name="Texas"))
+        storage.save()
+        tags.append(storage.version(State)[0])
+        self.assertEqual(len(set(tags)), 4)
+        self.assertIsNone(storage.version("Review")[1])
+
 
 if __name__ == "__main__":
     unittest.main()
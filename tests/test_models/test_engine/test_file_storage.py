@@ -1,9 +1,21 @@
 #!/usr/bin/python3
 """ Module for testing file storage"""
 import unittest
+from unittest.mock import patch
 from models.base_model import BaseModel
+from models.state import State
+from models.city import City
+from models.amenity import Amenity
+from models.place import Place
+from models.review import Review
 from models import storage
+from models.engine.file_storage import FileStorage
+import fcntl
+import json
 import os
+import threading
+import time
+from datetime import datetime
 
 
 class test_fileStorage(unittest.TestCase):
@@ -11,18 +23,15 @@ class test_fileStorage(unittest.TestCase):
 
     def setUp(self):
         """ Set up test environment """
-        del_list = []
-        for key in storage._FileStorage__objects.keys():
-            del_list.append(key)
-        for key in del_list:
-            del storage._FileStorage__objects[key]
+        self.clear()
 
     def tearDown(self):
         """ Remove storage file at end of tests """
-        try:
-            os.remove('file.json')
-        except Exception as e:
-            return "Error removing storage file: {}".format(e)
+        for path in ('file.json', 'file.json.log'):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
 
     def test_obj_list_empty(self):
         """ __objects is initially empty """
@@ -102,6 +111,558 @@ class test_fileStorage(unittest.TestCase):
             temp = key
         self.assertEqual(temp, 'BaseModel' + '.' + _id)
 
+    def test_all_cls(self):
+        """ all(cls) only returns objects of that class """
+        state = State(name="California")
+        city = City(name="San Francisco", state_id=state.id)
+        storage.new(state)
+        storage.new(city)
+        self.assertEqual(storage.all(State),
+                         {'State.' + state.id: state})
+        self.assertEqual(storage.all('City'), {'City.' + city.id: city})
+        self.assertEqual(storage.all('Review'), {})
+
+    def test_all_cls_after_delete(self):
+        """ Deleted objects are dropped from all(cls) """
+        state = State(name="California")
+        storage.new(state)
+        storage.delete(state)
+        self.assertEqual(storage.all(State), {})
+        self.assertEqual(len(storage.all()), 0)
+
+    def test_all_cls_after_reload(self):
+        """ reload rebuilds the per-class index """
+        state = State(name="California")
+        storage.new(state)
+        storage.save()
+        storage._FileStorage__objects.clear()
+        storage._FileStorage__by_class.clear()
+        storage._FileStorage__stats.clear()
+        storage.reload()
+        self.assertEqual(list(storage.all(State).keys()),
+                         ['State.' + state.id])
+
+    def test_get(self):
+        """ get returns the object with the given class and id """
+        state = State(name="California")
+        storage.new(state)
+        self.assertIs(storage.get(State, state.id), state)
+        self.assertIs(storage.get('State', state.id), state)
+        self.assertIsNone(storage.get(City, state.id))
+        self.assertIsNone(storage.get(State, "nope"))
+
+    def test_get_many(self):
+        """ get_many returns the objects found, keyed by id """
+        states = [State(name=str(i)) for i in range(3)]
+        for state in states:
+            storage.new(state)
+        self.assertEqual(storage.get_many(State, [states[0].id, "nope",
+                                                  states[2].id]),
+                         {states[0].id: states[0], states[2].id: states[2]})
+        self.assertEqual(storage.get_many('City', [states[0].id]), {})
+
+    def test_count(self):
+        """ count returns totals per class and overall """
+        storage.new(State(name="California"))
+        storage.new(State(name="Arizona"))
+        storage.new(City(name="Page", state_id="x"))
+        self.assertEqual(storage.count(), 3)
+        self.assertEqual(storage.count(State), 2)
+        self.assertEqual(storage.count('City'), 1)
+        self.assertEqual(storage.count('Review'), 0)
+
+    def test_counts(self):
+        """ counts returns every class total at once """
+        storage.new(State(name="California"))
+        storage.new(City(name="Page", state_id="x"))
+        counts = storage.counts()
+        self.assertEqual(counts['State'], 1)
+        self.assertEqual(counts['City'], 1)
+        self.assertEqual(counts['Review'], 0)
+
+    def test_version(self):
+        """ version changes when an object of the class changes """
+        state = State(name="California")
+        storage.new(state)
+        tag, changed = storage.version('State')
+        self.assertIsNotNone(changed)
+        storage.reload()
+        self.assertEqual(storage.version('State')[0], tag)
+        city_tag = storage.version('City')[0]
+        state.name = "Nevada"
+        self.assertNotEqual(storage.version('State')[0], tag)
+        self.assertEqual(storage.version('City')[0], city_tag)
+        tag = storage.version('State')[0]
+        storage.delete(state)
+        self.assertNotEqual(storage.version('State')[0], tag)
+
+    def test_version_filters(self):
+        """ version with filters only changes with the matching objects """
+        cities = [City(name="Page", state_id="a"),
+                  City(name="Reno", state_id="b")]
+        storage.bulk_save(cities)
+        tag_a = storage.version('City', state_id="a")[0]
+        tag_b = storage.version('City', state_id="b")[0]
+        cities[1].name = "Elko"
+        cities[1].save()
+        self.assertEqual(storage.version('City', state_id="a")[0], tag_a)
+        self.assertNotEqual(storage.version('City', state_id="b")[0], tag_b)
+        tag_b = storage.version('City', state_id="b")[0]
+        cities[0].state_id = "b"
+        cities[0].save()
+        self.assertNotEqual(storage.version('City', state_id="a")[0], tag_a)
+        self.assertNotEqual(storage.version('City', state_id="b")[0], tag_b)
+        tag = storage.version('City', id=cities[1].id)[0]
+        storage.delete(cities[1])
+        self.assertNotEqual(storage.version('City', id=cities[1].id)[0], tag)
+
+    def test_events(self):
+        """ listeners hear of saved changes with old and new references """
+        events = []
+        city = City(name="Page", state_id="a")
+        storage.on_new(events.append)
+        storage.on_save(events.append)
+        storage.on_delete(events.append)
+        try:
+            storage.new(city)
+            storage.save()
+            city.state_id = "b"
+            city.name = "Tempe"
+            self.assertEqual(len(events), 1)
+            storage.save()
+            storage.delete(city)
+            storage.save()
+        finally:
+            storage.remove_listener(events.append)
+        self.assertEqual([e.op for e in events], ["new", "save", "delete"])
+        self.assertEqual(events[0].class_name, "City")
+        self.assertEqual(events[0].id, city.id)
+        self.assertIn("state_id", events[0].changed_fields)
+        self.assertEqual(events[1].changed_fields, ("name", "state_id"))
+        self.assertEqual(events[1].refs, {"state_id": {"a", "b"}})
+        self.assertEqual(events[2].refs, {"state_id": {"b"}})
+        city.name = "Mesa"
+        storage.save()
+        self.assertEqual(len(events), 3)
+
+    def test_events_queued(self):
+        """ queued listeners are called from a worker thread """
+        events = []
+        storage.on_new(events.append, queued=True)
+        try:
+            storage.new(State(name="California"))
+            storage.save()
+            storage.join_listeners()
+        finally:
+            storage.remove_listener(events.append)
+        self.assertEqual([e.class_name for e in events], ["State"])
+
+    def test_changes(self):
+        """ changes lists the last change of each object after a cursor """
+        state = State(name="California")
+        city = City(name="Page", state_id=state.id)
+        storage.new(state)
+        storage.save()
+        entries, reset = storage.changes()
+        self.assertFalse(reset)
+        cursor = entries[-1][0]
+        storage.new(city)
+        storage.save()
+        state.name = "Arizona"
+        state.save()
+        storage.delete(city)
+        storage.save()
+        entries, reset = storage.changes(after=cursor)
+        self.assertEqual([(op, name, id) for _, op, name, id, _ in entries],
+                         [("put", "State", state.id),
+                          ("delete", "City", city.id)])
+        self.assertIs(entries[0][4], state)
+        self.assertEqual(storage.changes(after=entries[-1][0]), ([], False))
+        self.assertTrue(storage.changes(after=("stale", 0))[1])
+
+    def test_changes_since(self):
+        """ changes lists what was saved from a time on """
+        State(name="California").save()
+        time.sleep(0.01)
+        since = datetime.now()
+        state = State(name="Arizona")
+        state.save()
+        entries, reset = storage.changes(since=since)
+        self.assertEqual([(op, id) for _, op, _, id, _ in entries],
+                         [("put", state.id)])
+        self.assertEqual(storage.changes(since=datetime.now()), ([], False))
+
+    @patch.object(FileStorage, '_FileStorage__journal', True)
+    def test_changes_journal(self):
+        """ In journal mode cursors outlive the process until compact """
+        storage.reload()
+        states = [State(name=str(i)) for i in range(2)]
+        for state in states:
+            state.save()
+        entries, reset = storage.changes()
+        cursor = entries[0][0]
+        self.clear()
+        storage.reload()
+        entries, reset = storage.changes(after=cursor)
+        self.assertFalse(reset)
+        self.assertEqual([id for _, _, _, id, _ in entries], [states[1].id])
+        now = datetime.now().isoformat()
+        with open('file.json.log', 'a') as f:
+            f.write(json.dumps({"op": "put", "key": "State.b", "value": {
+                "__class__": "State", "id": "b", "name": "b",
+                "created_at": now, "updated_at": now}}) + "\n")
+        storage.delete(storage.get(State, states[0].id))
+        storage.save()
+        storage.reload()
+        entries, reset = storage.changes(after=cursor)
+        self.assertEqual([(op, id) for _, op, _, id, _ in entries],
+                         [("put", states[1].id), ("put", "b"),
+                          ("delete", states[0].id)])
+        storage.compact()
+        entries, reset = storage.changes(after=cursor)
+        self.assertTrue(reset)
+        self.assertEqual(sorted(id for _, _, _, id, _ in entries),
+                         sorted(["b", states[1].id]))
+
+    def test_changes_invalid_cursor(self):
+        """ A malformed cursor raises ValueError """
+        for cursor in ([], ("stale",), ("stale", "0"), ["a", "b", "c"]):
+            with self.assertRaises(ValueError):
+                storage.changes(after=cursor)
+
+    def test_iter(self):
+        """ iter yields the objects of one class or of all classes """
+        state = State(name="California")
+        city = City(name="Page", state_id=state.id)
+        storage.new(state)
+        storage.new(city)
+        self.assertEqual(list(storage.iter(State)), [state])
+        self.assertEqual(list(storage.iter('City', batch_size=1)), [city])
+        self.assertEqual(len(list(storage.iter())), 2)
+
+    def test_page(self):
+        """ page walks a class in (created_at, id) order """
+        states = [State(name=str(i)) for i in range(5)]
+        for state in reversed(states):
+            storage.new(state)
+        first = storage.page(State, 2)
+        self.assertEqual(first, states[:2])
+        after = (first[-1].created_at, first[-1].id)
+        self.assertEqual(storage.page('State', 10, after), states[2:])
+
+    def test_page_filters(self):
+        """ page only returns objects matching the filters """
+        cities = [City(name=str(i), state_id=str(i % 2)) for i in range(4)]
+        for city in cities:
+            storage.new(city)
+        self.assertEqual(storage.page(City, 10, state_id="1"),
+                         [cities[1], cities[3]])
+
+    def test_page_after_delete(self):
+        """ Deleted objects are dropped from the sorted index """
+        states = [State(name=str(i)) for i in range(3)]
+        for state in states:
+            storage.new(state)
+        storage.delete(states[1])
+        self.assertEqual(storage.page(State, 10), [states[0], states[2]])
+
+    def test_places_search(self):
+        """ places_search combines states, cities and amenities """
+        s1, s2 = State(name="1"), State(name="2")
+        c1 = City(name="1", state_id=s1.id)
+        c2 = City(name="2", state_id=s2.id)
+        wifi = Amenity(name="Wifi")
+        places = [Place(name=str(i), city_id=c.id)
+                  for i, c in enumerate([c1, c1, c2, c2])]
+        for obj in [s1, s2, c1, c2, wifi] + places:
+            storage.new(obj)
+        places[0].amenities.append(wifi)
+        places[2].amenities = wifi
+        self.assertEqual(storage.places_search(), places)
+        self.assertEqual(storage.places_search(states=[s1.id]), places[:2])
+        self.assertEqual(storage.places_search(states=[s1.id],
+                                               cities=[c2.id]), places)
+        self.assertEqual(storage.places_search(amenities=[wifi.id]),
+                         [places[0], places[2]])
+        self.assertEqual(storage.places_search(cities=[c2.id],
+                                               amenities=[wifi.id]),
+                         [places[2]])
+        after = (places[0].created_at, places[0].id)
+        self.assertEqual(storage.places_search(limit=1, after=after),
+                         [places[1]])
+
+    def test_place_amenities(self):
+        """ Linked amenities are saved as ids of that place only """
+        wifi = Amenity(name="Wifi")
+        home, cabin = Place(name="Home"), Place(name="Cabin")
+        for obj in (wifi, home, cabin):
+            storage.new(obj)
+        home.amenities.append(wifi)
+        storage.save()
+        self.clear()
+        storage.reload()
+        home = storage.get(Place, home.id)
+        self.assertEqual(home.amenity_ids, [wifi.id])
+        self.assertEqual(home.amenities, [storage.get(Amenity, wifi.id)])
+        self.assertEqual(storage.get(Place, cabin.id).amenity_ids, [])
+        self.assertEqual(storage.places_search(amenities=[wifi.id]), [home])
+        home.amenities.remove(home.amenities[0])
+        self.assertEqual(storage.places_search(amenities=[wifi.id]), [])
+
+    def test_places_search_after_update(self):
+        """ A place moved to another city is found under the new one """
+        place = Place(name="1", city_id="a")
+        storage.new(place)
+        place.city_id = "b"
+        storage.new(place)
+        self.assertEqual(storage.places_search(cities=["a"]), [])
+        self.assertEqual(storage.places_search(cities=["b"]), [place])
+
+    def clear(self):
+        """ Drop every object from memory without saving """
+        for name, value in vars(FileStorage).items():
+            if name.startswith('_FileStorage__') and \
+                    type(value) in (dict, list):
+                value.clear()
+        storage._FileStorage__journal_len = 0
+
+    @patch.object(FileStorage, '_FileStorage__journal', True)
+    def test_journal_save(self):
+        """ In journal mode save appends changes instead of rewriting """
+        state = State(name="California")
+        state.save()
+        self.assertFalse(os.path.exists('file.json'))
+        state.name = "Arizona"
+        state.save()
+        with open('file.json.log') as f:
+            self.assertEqual(len(f.readlines()), 2)
+        self.clear()
+        storage.reload()
+        self.assertEqual(storage.get(State, state.id).name, "Arizona")
+
+    @patch.object(FileStorage, '_FileStorage__journal', True)
+    def test_journal_setattr(self):
+        """ Attributes set on a stored object are written by save """
+        state = State(name="California")
+        state.save()
+        state.name = "Arizona"
+        storage.save()
+        self.clear()
+        storage.reload()
+        self.assertEqual(storage.get(State, state.id).name, "Arizona")
+
+    @patch.object(FileStorage, '_FileStorage__journal', True)
+    def test_journal_delete(self):
+        """ Deletes are replayed from the journal """
+        state = State(name="California")
+        state.save()
+        storage.compact()
+        storage.delete(state)
+        storage.save()
+        self.clear()
+        storage.reload()
+        self.assertIsNone(storage.get(State, state.id))
+
+    @patch.object(FileStorage, '_FileStorage__journal', True)
+    @patch.object(FileStorage, '_FileStorage__journal_max', 2)
+    def test_journal_compact(self):
+        """ Reaching journal_max folds the journal into the file """
+        State(name="1").save()
+        self.assertTrue(os.path.exists('file.json.log'))
+        State(name="2").save()
+        self.assertFalse(os.path.exists('file.json.log'))
+        self.clear()
+        storage.reload()
+        self.assertEqual(storage.count(State), 2)
+
+    @patch.object(FileStorage, '_FileStorage__journal', True)
+    def test_journal_torn_line(self):
+        """ A partly written last entry is ignored on reload """
+        state = State(name="California")
+        state.save()
+        with open('file.json.log', 'a') as f:
+            f.write('{"op": "put", "ke')
+        self.clear()
+        storage.reload()
+        self.assertEqual(storage.count(), 1)
+
+    @patch.object(FileStorage, '_FileStorage__journal', True)
+    def test_journal_save_after_torn_line(self):
+        """ Saves after a torn entry are not lost on the next reload """
+        State(name="California").save()
+        with open('file.json.log', 'a') as f:
+            f.write('{"op": "put", "ke')
+        self.clear()
+        storage.reload()
+        State(name="Arizona").save()
+        State(name="Nevada").save()
+        self.clear()
+        storage.reload()
+        self.assertEqual(sorted(s.name for s in storage.all(State).values()),
+                         ["Arizona", "California", "Nevada"])
+
+    @patch.object(FileStorage, '_FileStorage__journal', True)
+    def test_journal_bad_line(self):
+        """ Entries after an unreadable one are replayed """
+        State(name="California").save()
+        with open('file.json.log', 'a') as f:
+            f.write('{"op": "put", "ke\n')
+        State(name="Arizona").save()
+        self.clear()
+        storage.reload()
+        self.assertEqual(storage.count(State), 2)
+
+    @patch.object(FileStorage, '_FileStorage__journal', True)
+    def test_journal_concurrent_writer(self):
+        """ A reload while another process appends loses nothing """
+        State(name="California").save()
+        now = datetime.now().isoformat()
+        lines = [json.dumps({"op": "put", "key": "State." + id, "value": {
+            "__class__": "State", "id": id, "name": id,
+            "created_at": now, "updated_at": now}}) + "\n"
+            for id in ("b", "c")]
+        writer = open('file.json.log', 'ab')
+        fcntl.flock(writer, fcntl.LOCK_EX)
+        writer.write(lines[0][:20].encode())
+        writer.flush()
+        size = os.path.getsize('file.json.log')
+        self.clear()
+        storage.reload()
+        self.assertEqual(storage.count(State), 1)
+        self.assertEqual(os.path.getsize('file.json.log'), size)
+        saver = threading.Thread(target=State(name="Nevada").save)
+        saver.start()
+        writer.write((lines[0][20:] + lines[1]).encode())
+        writer.close()
+        saver.join()
+        self.clear()
+        storage.reload()
+        self.assertEqual(sorted(s.name for s in storage.all(State).values()),
+                         ["California", "Nevada", "b", "c"])
+
+    def test_save_atomic(self):
+        """ A failed save leaves the previous file in place """
+        state = State(name="California")
+        state.save()
+        with open('file.json') as f:
+            before = f.read()
+        storage.new(State(name="Arizona"))
+        with patch('os.replace', side_effect=OSError):
+            with self.assertRaises(OSError):
+                storage.save()
+        with open('file.json') as f:
+            self.assertEqual(f.read(), before)
+        self.assertEqual([p for p in os.listdir('.') if p.endswith('.tmp')],
+                         [])
+
+    def test_fsync_policy(self):
+        """ save fsyncs according to the fsync policy """
+        for policy, calls in (("always", 2), ("never", 0)):
+            with patch.object(FileStorage, '_FileStorage__fsync', policy), \
+                    patch('os.fsync') as fsync:
+                storage.save()
+                self.assertEqual(fsync.call_count, calls)
+
+    def test_fsync_batched(self):
+        """ a write within the fsync interval is fsynced once it passed """
+        with patch.object(FileStorage, '_FileStorage__fsync', "batched"), \
+                patch.object(FileStorage, '_FileStorage__fsync_interval',
+                             0.2), patch('os.fsync') as fsync:
+            storage.sync()
+            State(name="California").save()
+            self.assertEqual(fsync.call_count, 0)
+            time.sleep(0.5)
+            self.assertEqual(fsync.call_count, 2)
+
+    def test_save_only_serializes_changes(self):
+        """ save calls to_dict only for objects changed since last save """
+        states = [State(name=str(i)) for i in range(3)]
+        for state in states:
+            storage.new(state)
+        storage.save()
+        states[0].name = "changed"
+        with patch.object(State, 'to_dict', autospec=True,
+                          side_effect=BaseModel.to_dict) as to_dict:
+            storage.save()
+            self.assertEqual(to_dict.call_count, 1)
+        self.clear()
+        storage.reload()
+        self.assertEqual(storage.get(State, states[0].id).name, "changed")
+
+    def test_reload_keeps_unchanged(self):
+        """ reload keeps the objects and JSON of unchanged records """
+        states = [State(name=str(i)) for i in range(3)]
+        storage.bulk_save(states)
+        storage.reload()
+        self.assertIs(storage.get(State, states[0].id), states[0])
+        with open('file.json') as f:
+            data = f.read().replace('"name": "1"', '"name": "one"')
+        with open('file.json', 'w') as f:
+            f.write(data)
+        storage.reload()
+        self.assertIs(storage.get(State, states[0].id), states[0])
+        self.assertEqual(storage.get(State, states[1].id).name, "one")
+        states[2].name = "two"
+        with patch.object(State, 'to_dict', autospec=True,
+                          side_effect=BaseModel.to_dict) as to_dict:
+            storage.save()
+            self.assertEqual(to_dict.call_count, 2)
+
+    def test_save_after_delete(self):
+        """ Deleted objects are dropped from the saved file """
+        state = State(name="California")
+        state.save()
+        storage.delete(state)
+        storage.save()
+        self.clear()
+        storage.reload()
+        self.assertEqual(storage.count(), 0)
+
+    def test_related(self):
+        """ Relationship properties answer from the reverse indexes """
+        state = State(name="California")
+        city = City(name="Page", state_id=state.id)
+        place = Place(name="Home", city_id=city.id, user_id="u")
+        review = Review(text="Nice", place_id=place.id, user_id="u")
+        for obj in (state, city, place, review):
+            storage.new(obj)
+        self.assertEqual(state.cities, [city])
+        self.assertEqual(city.places, [place])
+        self.assertEqual(place.reviews, [review])
+        self.assertEqual(storage.related(Review, "user_id", "u"), [review])
+        storage.delete(review)
+        self.assertEqual(place.reviews, [])
+
+    def test_related_after_setattr(self):
+        """ Setting a foreign key moves the object between parents """
+        city = City(name="Page", state_id="a")
+        storage.new(city)
+        city.state_id = "b"
+        self.assertEqual(storage.related(City, "state_id", "a"), [])
+        self.assertEqual(storage.related(City, "state_id", "b"), [city])
+
+    def test_with_related(self):
+        """ Loader specs are accepted and ignored in file mode """
+        state = State(name="California")
+        storage.new(state)
+        self.assertIs(storage.get(State, state.id, with_related=("cities",)),
+                      state)
+        self.assertEqual(storage.all(State, with_related=("cities",)),
+                         {'State.' + state.id: state})
+
+    def test_bulk_save(self):
+        """ bulk_save adds every object and writes the file once """
+        states = [State(name=str(i)) for i in range(5)]
+        with patch.object(FileStorage, 'compact', autospec=True,
+                          side_effect=FileStorage.compact) as compact:
+            report = storage.bulk_save(reversed(states))
+            self.assertEqual(compact.call_count, 1)
+        self.assertEqual(report["count"], 5)
+        self.assertEqual(storage.page(State, 10), states)
+        self.clear()
+        storage.reload()
+        self.assertEqual(storage.count(State), 5)
+
     def test_storage_var_created(self):
         """ FileStorage object storage created """
         from models.engine.file_storage import FileStorage
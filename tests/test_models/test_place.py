@@ -1,6 +1,8 @@
 #!/usr/bin/python3
 """ Test module for place.py file. """
 
+import os
+import unittest
 from tests.test_models.test_base_model import test_basemodel
 from models.place import Place
 
@@ -68,3 +70,14 @@ class test_Place(test_basemodel):
         """ Tests the amenity id """
         new = self.value()
         self.assertEqual(type(new.amenity_ids), list)
+
+    @unittest.skipIf(os.getenv('HBNB_TYPE_STORAGE') == 'db', "FileStorage")
+    def test_own_amenity_ids(self):
+        """ Each place has its own list of amenity ids """
+        self.assertIsNot(self.value().amenity_ids, self.value().amenity_ids)
+
+    def test_indexes(self):
+        """ Foreign keys are indexed together with created_at """
+        names = {i.name for i in self.value.__table__.indexes}
+        self.assertIn("ix_places_city_id_created_at", names)
+        self.assertIn("ix_places_user_id_created_at", names)
@@ -32,3 +32,8 @@ class test_User(test_basemodel):
         """ """
         new = self.value()
         self.assertNotEqual(type(new.password), str)
+
+    def test_email_index(self):
+        """ users.email has a unique index """
+        index = {i.name: i for i in self.value.__table__.indexes}
+        self.assertTrue(index["ix_users_email"].unique)
@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+""" Module used to test the web_flask hbnb page """
+
+import os
+import unittest
+from importlib import import_module
+from models import storage
+from models.engine.file_storage import FileStorage
+from models.state import State
+from models.city import City
+from models.place import Place
+from models.user import User
+
+
+@unittest.skipIf(os.getenv('HBNB_TYPE_STORAGE') == 'db', "FileStorage")
+class test_100_hbnb(unittest.TestCase):
+    """ Test class for the /hbnb page """
+
+    def setUp(self):
+        """ Start from an empty storage """
+        for name, value in vars(FileStorage).items():
+            if name.startswith('_FileStorage__') and type(value) is dict:
+                value.clear()
+        self.client = import_module("web_flask.100-hbnb").app.test_client()
+
+    def tearDown(self):
+        """ Remove the storage file """
+        try:
+            os.remove('file.json')
+        except FileNotFoundError:
+            pass
+
+    def test_hbnb(self):
+        """ /hbnb renders places with their owner """
+        state = State(name="California")
+        city = City(name="Page", state_id=state.id)
+        user = User(email="a@b.c", password="pwd", first_name="Betty",
+                    last_name="Holberton")
+        place = Place(name="Home", city_id=city.id, user_id=user.id)
+        for obj in (state, city, user, place):
+            storage.new(obj)
+        storage.save()
+        response = self.client.get('/hbnb')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"Betty Holberton", response.data)
+
+
+if __name__ == "__main__":
+    unittest.main()
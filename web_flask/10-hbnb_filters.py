@@ -15,7 +15,7 @@ app = Flask(__name__)
 @app.route("/hbnb_filters", strict_slashes=False)
 def hbnb_filters():
     """Displays the HBnB filters HTML page."""
-    states = storage.all("State")
+    states = storage.all("State", with_related=("cities",))
     amenities = storage.all("Amenity")
     return render_template("10-hbnb_filters.html",
                            states=states, amenities=amenities)
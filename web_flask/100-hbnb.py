@@ -17,8 +17,8 @@ app = Flask(__name__)
 def hbnb():
     """Display the HTML page for hbnb home page."""
     amenities = storage.all("Amenity")
-    places = storage.all("Place")
-    states = storage.all("State")
+    places = storage.all("Place", with_related=("user",))
+    states = storage.all("State", with_related=("cities",))
     return render_template("100-hbnb.html",
                            amenities=amenities,
                            places=places,
@@ -26,9 +26,9 @@ def states():
 @app.route("/states/<id>", strict_slashes=False)
 def states_id(id):
     """Displays an HTML page with info about <id>, if it exists."""
-    for state in storage.all("State").values():
-        if state.id == id:
-            return render_template("9-states.html", state=state)
+    state = storage.get("State", id, with_related=("cities",))
+    if state is not None:
+        return render_template("9-states.html", state=state)
     return render_template("9-states.html")
 
 